@@ -12,11 +12,16 @@ Objectifs :
 
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Iterable, Sequence
+from typing import Dict, Iterable, Sequence, Tuple
 
 import os
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 
 
 # ---------------------------------------------------------------------
@@ -27,15 +32,39 @@ PROJECT_ROOT: Path = Path(__file__).resolve().parents[1]
 DATA_RAW_PATH: Path = PROJECT_ROOT / "data" / "raw"
 DATA_PROCESSED_PATH: Path = PROJECT_ROOT / "data" / "processed"
 
+#: Colonnes "liste de chaînes" (stockées en Arrow list<string> dans les parquet)
+LIST_STRING_COLS: Tuple[str, ...] = ("tags", "ingredients", "steps")
+
+#: Taille des blocs du parseur CSV Arrow (un bloc = une unité de travail par thread)
+_ARROW_CSV_BLOCK_SIZE: int = 8 << 20
+#: Chaînes lues comme valeurs manquantes : liste par défaut de pd.read_csv
+_CSV_NA_VALUES: Tuple[str, ...] = (
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND",
+    "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+)
+
 
 # ---------------------------------------------------------------------
 # Helpers internes
 # ---------------------------------------------------------------------
 
+@lru_cache(maxsize=8)
+def _dir_listing(directory: Path, pattern: str, mtime: float) -> str:
+    """
+    Liste triée des fichiers d'un dossier (pour les messages d'erreur), mise en cache.
+    mtime fait partie de la clé : tout ajout/suppression dans le dossier invalide l'entrée.
+    """
+    return ", ".join(sorted(p.name for p in directory.glob(pattern)))
+
+
 def _ensure_exists(path: Path) -> None:
     """Lève une erreur explicite si le fichier demandé n'existe pas."""
     if not path.exists():
-        available = ", ".join(p.name for p in DATA_RAW_PATH.glob("*")) if DATA_RAW_PATH.exists() else "n/a"
+        available = (
+            _dir_listing(DATA_RAW_PATH, "*", DATA_RAW_PATH.stat().st_mtime)
+            if DATA_RAW_PATH.exists()
+            else "n/a"
+        )
         raise FileNotFoundError(
             f"Fichier non trouvé : {path}\n"
             f"Dossier RAW : {DATA_RAW_PATH}\n"
@@ -43,12 +72,68 @@ def _ensure_exists(path: Path) -> None:
         )
 
 
-def _read_csv_no_cast(path: Path, **read_csv_kwargs) -> pd.DataFrame:
+def _is_temporal(t: pa.DataType) -> bool:
+    """True pour les types date / heure / timestamp qu'Arrow peut inférer d'un CSV."""
+    return pa.types.is_date(t) or pa.types.is_time(t) or pa.types.is_timestamp(t)
+
+
+def _read_csv_arrow(path: Path) -> pd.DataFrame:
+    """
+    Lecture CSV multi-thread via pyarrow.
+    - Tente d'abord utf-8 ; si Arrow ne peut décoder une colonne (type binary), relit en latin-1.
+    - Pas d'inférence date/heure/timestamp : ces colonnes sont lues en string, texte
+      d'origine intact (un cast a posteriori réécrirait "2020-01-01T10:00:00").
+      On ne caste rien ici.
+    - Colonnes numériques / texte : mêmes dtypes pandas que pd.read_csv (backend numpy),
+      mêmes marqueurs de valeurs manquantes, manquants texte en NaN (Arrow donne None).
+    - Retours à la ligne autorisés dans les champs entre guillemets (descriptions) :
+      sans cette option, Arrow échoue dès que le fichier dépasse un bloc.
+    """
+    parse_options = pacsv.ParseOptions(newlines_in_values=True)
+    for encoding in ("utf8", "latin1"):
+        read_options = pacsv.ReadOptions(
+            use_threads=True, block_size=_ARROW_CSV_BLOCK_SIZE, encoding=encoding
+        )
+        convert_options = pacsv.ConvertOptions(
+            strings_can_be_null=True, null_values=list(_CSV_NA_VALUES)
+        )
+        # Arrow infère les types sur le premier bloc : le lecteur en flux donne ce schéma
+        # sans lire tout le fichier, les colonnes temporelles sont alors forcées en string
+        with pacsv.open_csv(
+            path, read_options=read_options, parse_options=parse_options,
+            convert_options=convert_options,
+        ) as reader:
+            temporal = [f.name for f in reader.schema if _is_temporal(f.type)]
+        convert_options.column_types = {name: pa.string() for name in temporal}
+        table = pacsv.read_csv(
+            path,
+            read_options=read_options,
+            parse_options=parse_options,
+            convert_options=convert_options,
+        )
+        if not any(pa.types.is_binary(f.type) for f in table.schema):
+            break
+    if any(_is_temporal(f.type) for f in table.schema):
+        raise pa.ArrowInvalid("colonne temporelle inférée hors du premier bloc")  # -> pandas
+    df = table.to_pandas()
+    for col in df.columns[df.dtypes == object]:
+        df[col] = df[col].fillna(np.nan)  # None -> NaN, comme pd.read_csv
+    return df
+
+
+def _read_csv_no_cast(path: Path, use_arrow: bool = True, **read_csv_kwargs) -> pd.DataFrame:
     """
     Lecture CSV SANS forcer les types.
+    - use_arrow=True (et aucun kwarg pandas) : parseur pyarrow multi-thread.
+      En cas d'échec côté Arrow, repli sur pandas.
     - Tente d'abord utf-8, puis latin-1 si besoin.
     - Laisse pandas inférer dtypes (on transformera plus tard en preprocessing).
     """
+    if use_arrow and not read_csv_kwargs:
+        try:
+            return _read_csv_arrow(path)
+        except pa.ArrowInvalid:
+            pass
     try:
         df = pd.read_csv(path, **read_csv_kwargs)
     except UnicodeDecodeError:
@@ -65,26 +150,28 @@ def _log_loaded(name: str, df: pd.DataFrame) -> None:
 # API publique : fonctions de chargement spécialisées
 # ---------------------------------------------------------------------
 
-def load_recipes(file_name: str = "RAW_recipes.csv", **read_csv_kwargs) -> pd.DataFrame:
+def load_recipes(file_name: str = "RAW_recipes.csv", use_arrow: bool = True, **read_csv_kwargs) -> pd.DataFrame:
     """
     Charge le dataset des recettes depuis data/raw/.
     Ne modifie PAS les types : objectif = lecture simple et fiable.
+    use_arrow=False force le parseur pandas.
     """
     file_path = DATA_RAW_PATH / file_name
     _ensure_exists(file_path)
-    df = _read_csv_no_cast(file_path, **read_csv_kwargs)
+    df = _read_csv_no_cast(file_path, use_arrow=use_arrow, **read_csv_kwargs)
     _log_loaded(file_name, df)
     return df
 
 
-def load_interactions(file_name: str = "RAW_interactions.csv", **read_csv_kwargs) -> pd.DataFrame:
+def load_interactions(file_name: str = "RAW_interactions.csv", use_arrow: bool = True, **read_csv_kwargs) -> pd.DataFrame:
     """
     Charge le dataset des interactions (notes/commentaires) depuis data/raw/.
     Ne modifie PAS les types.
+    use_arrow=False force le parseur pandas.
     """
     file_path = DATA_RAW_PATH / file_name
     _ensure_exists(file_path)
-    df = _read_csv_no_cast(file_path, **read_csv_kwargs)
+    df = _read_csv_no_cast(file_path, use_arrow=use_arrow, **read_csv_kwargs)
     _log_loaded(file_name, df)
     return df
 
@@ -128,14 +215,33 @@ def sanity_check() -> None:
     print()
 
 
+def _arrow_schema(df: pd.DataFrame) -> pa.Schema:
+    """
+    Schéma Arrow inféré, en forçant list<string> pour les colonnes de LIST_STRING_COLS
+    qui contiennent des listes (ou uniquement des None) : type stable d'un fichier à l'autre.
+    """
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    for c in LIST_STRING_COLS:
+        i = schema.get_field_index(c)
+        if i < 0:
+            continue
+        dtype = schema.field(i).type
+        if pa.types.is_list(dtype) or pa.types.is_null(dtype):
+            schema = schema.set(i, pa.field(c, pa.list_(pa.string())))
+    return schema
+
+
 def save_parquet(df: pd.DataFrame, name: str) -> Path:
     """
     Sauvegarde un DataFrame en Parquet dans data/processed/.
     (Aucune transformation ici, simple I/O.)
+    Les colonnes liste sont écrites en Arrow list<string> natif (compression zstd) :
+    relues avec dtype_backend="pyarrow", elles ne demandent aucune conversion Python.
     """
     DATA_PROCESSED_PATH.mkdir(parents=True, exist_ok=True)
     out = DATA_PROCESSED_PATH / name
-    df.to_parquet(out, index=False)
+    table = pa.Table.from_pandas(df, schema=_arrow_schema(df), preserve_index=False)
+    pq.write_table(table, out, compression="zstd")
     print(f"💾 Sauvegardé : {out.relative_to(PROJECT_ROOT)}  shape={df.shape}")
     return out
 
@@ -155,7 +261,10 @@ def load_parquet(name: str, **read_parquet_kwargs) -> pd.DataFrame:
 
     # Vérification d’existence
     if not file_path.exists():
-        available = ", ".join(p.name for p in DATA_PROCESSED_PATH.glob("*.parquet")) or "aucun"
+        available = (
+            _dir_listing(DATA_PROCESSED_PATH, "*.parquet", DATA_PROCESSED_PATH.stat().st_mtime)
+            or "aucun"
+        )
         raise FileNotFoundError(
             f"❌ Fichier introuvable : {file_path}\n"
             f"Fichiers disponibles dans processed/ : {available}"
@@ -166,27 +275,45 @@ def load_parquet(name: str, **read_parquet_kwargs) -> pd.DataFrame:
     print(f"✅ {file_path.name} chargé ({df.shape[0]} lignes, {df.shape[1]} colonnes)")
     return df
 
+
+def load_parquet_cols(name: str, columns: Sequence[str], **read_parquet_kwargs) -> pd.DataFrame:
+    """
+    Charge UNIQUEMENT certaines colonnes d'un Parquet de data/processed/.
+    Parquet étant columnaire, les autres colonnes ne sont ni lues ni décodées.
+
+    Exemple :
+        df = load_parquet_cols("recipes_enriched.parquet", ["minutes", "n_steps"])
+    """
+    return load_parquet(name, columns=list(columns), **read_parquet_kwargs)
+
 # --- Normalisation post-lecture pour colonnes liste ---
 import ast
+import json
 import numpy as np
 import pandas as pd
 from typing import Iterable
 
 def _to_list_or_none(x):
     """Convertit str/ndarray -> list ; garde list ; NaN/None -> None ; sinon -> None."""
-    if x is None:
+    t = type(x)
+    if t is list:  # chemin court (colonne déjà normalisée)
+        return x
+    if x is None or (t is float and x != x):
         return None
     if isinstance(x, list):
         return x
     if isinstance(x, np.ndarray):
         return list(x)
-    # gérer NaN après ndarray
-    try:
-        if pd.isna(x):
-            return None
-    except Exception:
-        pass
     if isinstance(x, str):
+        # blancs de tête tolérés, comme ast.literal_eval (lstrip(" \t"))
+        if x.lstrip(" \t")[:1] != "[":
+            return None
+        # chemin rapide json (C) si la substitution ' -> " est sans ambiguïté
+        if '"' not in x and "\\" not in x:
+            try:
+                return json.loads(x.replace("'", '"'))
+            except json.JSONDecodeError:
+                pass
         try:
             v = ast.literal_eval(x)
             return v if isinstance(v, list) else None
@@ -195,20 +322,65 @@ def _to_list_or_none(x):
     return None
 
 
+def _is_arrow_list(s: pd.Series) -> bool:
+    """True si la série est déjà une colonne Arrow de type list<...>."""
+    return isinstance(s.dtype, pd.ArrowDtype) and pa.types.is_list(s.dtype.pyarrow_dtype)
+
+
 def _normalize_list_columns(df: pd.DataFrame, list_cols: Iterable[str]) -> pd.DataFrame:
-    """Force les colonnes spécifiées à être des listes Python ou None (idempotent)."""
-    out = df.copy()
+    """Force les colonnes spécifiées à être des listes Python ou manquantes (idempotent)."""
+    out = df.copy(deep=False)  # on ne fait que réassigner des colonnes
     for c in list_cols:
         if c in out.columns:
-            out[c] = out[c].apply(_to_list_or_none)
+            if _is_arrow_list(out[c]):
+                continue  # déjà en list<...> Arrow (dtype_backend="pyarrow") : rien à convertir
+            # na_action="ignore" : les cellules manquantes ne passent pas par la fonction
+            out[c] = out[c].map(_to_list_or_none, na_action="ignore")
     return out
 
-def load_parquet_safe(name: str, list_cols: Iterable[str] = ("tags","ingredients","steps"), **kwargs) -> pd.DataFrame:
+def _norm_sidecar(file_path: Path) -> Path:
+    """Chemin du cache normalisé associé à un parquet (ex: recipes.parquet -> recipes.norm.pkl)."""
+    return file_path.with_suffix(".norm.pkl")
+
+
+def load_parquet_safe(
+    name: str,
+    list_cols: Iterable[str] = LIST_STRING_COLS,
+    use_cache: bool = True,
+    **kwargs,
+) -> pd.DataFrame:
     """
     Charge un .parquet depuis data/processed/ puis normalise les colonnes liste.
     N’exige AUCUNE modif de preprocessing.
+
+    Avec dtype_backend="pyarrow", les colonnes liste restent en Arrow list<...>
+    et ne sont pas reconverties cellule par cellule.
+
+    Cache : le résultat normalisé est écrit à côté du parquet (<nom>.norm.pkl).
+    Tant que ce fichier est plus récent que le parquet, il est relu directement
+    (pickle conserve les listes Python -> aucun re-parsing). Le cache est ignoré
+    si des kwargs de lecture sont passés (ex: columns=...) ou si use_cache=False.
     """
+    list_cols = tuple(list_cols)
+    file_path = DATA_PROCESSED_PATH / name
+    sidecar = _norm_sidecar(file_path)
+    cacheable = use_cache and not kwargs
+
+    if (
+        cacheable
+        and file_path.exists()
+        and sidecar.exists()
+        and sidecar.stat().st_mtime >= file_path.stat().st_mtime
+    ):
+        df = pd.read_pickle(sidecar)
+        if df.attrs.get("normalized_list_cols") == list_cols:
+            print(f"⚡ {name} chargé depuis le cache ({df.shape[0]} lignes, {df.shape[1]} colonnes)")
+            return df
+
     df = load_parquet(name, **kwargs)  # ta fonction existante
     df = _normalize_list_columns(df, list_cols)
+    if cacheable:
+        df.attrs["normalized_list_cols"] = list_cols
+        df.to_pickle(sidecar)
     print(f"✅ {name} chargé & normalisé (colonnes liste: {list(list_cols)})")
     return df
@@ -7,6 +7,7 @@ Objectifs (stricts) :
 - Découper la colonne 'nutrition' en 7 colonnes dédiées.
 - Convertir les colonnes temporelles (submitted -> datetime + parties utiles).
 - Caster contributor_id en catégoriel.
+- Réduire les dtypes numériques (int64 -> int32, float64 -> float32) pour alléger les stats.
 - Fournir un pipeline "convert_recipes_for_univariate" idempotent.
 
 Exclusions :
@@ -16,10 +17,13 @@ Exclusions :
 
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Iterable, Optional, Sequence, Tuple, List
+from typing import Any, Iterable, Optional, Sequence, Tuple
 
 import ast
+import json
+import numpy as np
 import pandas as pd
 
 
@@ -41,26 +45,35 @@ NUTRITION_COLS: Tuple[str, ...] = (
 #: Colonnes list-like attendues dans recipes
 DEFAULT_LIST_LIKE_COLS: Tuple[str, ...] = ("tags", "ingredients", "steps", "nutrition")
 
+#: Downcast int32 seulement si |x| < 2**30 : marge pour x * 2, x + y sans débordement
+#: (ex. minutes de Food.com contient 2147483647, exactement int32.max)
+_INT32_DOWNCAST_LIMIT: int = 2 ** 30
+
 
 # ---------------------------------------------------------------------
 # Helpers internes (purs, idempotents)
 # ---------------------------------------------------------------------
 
-def _safe_literal_eval(x: Any) -> Any:
+def _parse_list_str(x: str) -> Optional[list]:
     """
-    Convertit une chaîne représentant une structure Python (liste/dict)
-    en objet Python. Si la conversion échoue, renvoie la valeur d'origine.
-    - Idempotent : si x est déjà list/dict -> renvoie x.
-    - Ne modifie pas NaN/None.
+    Parse une chaîne "['a', 'b']" / "[51.5, 0.0]" en liste Python, ou None.
+    - Chemin rapide : json.loads (parseur C) après passage des quotes simples en doubles.
+      Uniquement quand la chaîne ne contient ni '"' ni '\\' : la substitution est alors exacte.
+    - Repli : ast.literal_eval (apostrophes internes, None, tuples, ...).
     """
-    if isinstance(x, (list, dict)) or pd.isna(x):
-        return x
-    if isinstance(x, str):
+    # blancs de tête tolérés, comme ast.literal_eval (lstrip(" \t"))
+    if x.lstrip(" \t")[:1] != "[":
+        return None
+    if '"' not in x and "\\" not in x:
         try:
-            return ast.literal_eval(x)
-        except (ValueError, SyntaxError):
-            return x
-    return x
+            return json.loads(x.replace("'", '"'))
+        except json.JSONDecodeError:
+            pass
+    try:
+        parsed = ast.literal_eval(x)
+    except (ValueError, SyntaxError):
+        return None
+    return parsed if isinstance(parsed, list) else None
 
 
 def _ensure_list_or_none(x: Any) -> Optional[list]:
@@ -71,34 +84,89 @@ def _ensure_list_or_none(x: Any) -> Optional[list]:
     - NaN/None -> None
     - sinon -> None (on ne force pas des types improbables)
     """
-    if pd.isna(x):
+    t = type(x)
+    if t is list:  # chemin court (colonne déjà normalisée) : pas de pd.isna
+        return x
+    if t is str:
+        return _parse_list_str(x)
+    if x is None or (t is float and x != x):
         return None
     if isinstance(x, list):
         return x
-    parsed = _safe_literal_eval(x)
-    return parsed if isinstance(parsed, list) else None
+    if isinstance(x, str):
+        return _parse_list_str(x)
+    return None
+
+
+def _parse_list_array(arr: np.ndarray) -> np.ndarray:
+    """
+    Boucle de parsing sur un tableau numpy object (fonction de module : picklable,
+    donc utilisable dans un ProcessPoolExecutor).
+    Même contrat que _ensure_list_or_none : list -> list ; str convertible -> list ; le reste -> None.
+    """
+    out = np.empty_like(arr)  # dtype object, pré-rempli à None
+    _parse = _parse_list_str
+    _list = list
+    _str = str
+    for i, v in enumerate(arr):
+        t = type(v)
+        if t is _list:
+            out[i] = v
+        elif t is _str:
+            out[i] = _parse(v)
+        # None / NaN / autres types : on laisse None
+    return out
+
+
+def _parse_list_column(s: pd.Series) -> pd.Series:
+    """
+    Version "colonne" de _ensure_list_or_none : une seule boucle sur le tableau numpy.
+    - Évite le dispatch pandas par cellule (Series.apply) et les appels à pd.isna.
+    """
+    out = _parse_list_array(s.to_numpy(dtype=object))
+    return pd.Series(out, index=s.index, name=s.name)
 
 
 def _copy(df: pd.DataFrame) -> pd.DataFrame:
-    """Raccourci lisible pour travailler en pure function."""
-    return df.copy()
+    """
+    Raccourci lisible pour travailler en pure function.
+    Copie superficielle : les conversions ne font qu'(ré)assigner des colonnes,
+    jamais modifier un tableau existant en place -> l'original reste intact.
+    """
+    return df.copy(deep=False)
 
 
-def _pad_or_none(lst: Optional[List[Any]], n: int) -> List[Optional[Any]]:
+def _nutrition_array(values: np.ndarray, n_out: int) -> np.ndarray:
     """
-    Prend une liste (ou None) et renvoie une liste de longueur n :
-    - si lst est None ou pas une liste -> [None]*n
-    - si len(lst) == n -> lst
-    - si len(lst) < n -> lst + [None]*(n-len(lst))
-    - si len(lst) > n -> lst[:n]
+    Construit le tableau (n, n_out) float64 (NaN par défaut) à partir des cellules 'nutrition'.
+    - Les listes de longueur exacte n_out (quasi toutes) sont converties en bloc par numpy (C).
+    - Les autres (trop courtes/longues, ndarray relus depuis parquet, valeurs non numériques)
+      sont remplies cellule par cellule avec pad NaN / troncature.
     """
-    if not isinstance(lst, list):
-        return [None] * n
-    if len(lst) == n:
-        return lst
-    if len(lst) < n:
-        return lst + [None] * (n - len(lst))
-    return lst[:n]
+    arr = np.full((len(values), n_out), np.nan, dtype=np.float64)
+    exact_idx, exact_rows, rest = [], [], []
+    for i, v in enumerate(values):
+        if type(v) is str:
+            v = _parse_list_str(v)
+        if type(v) is list and len(v) == n_out:
+            exact_idx.append(i)
+            exact_rows.append(v)
+        elif isinstance(v, (list, np.ndarray)):
+            rest.append((i, v))
+
+    if exact_rows:
+        try:
+            arr[exact_idx] = np.array(exact_rows, dtype=np.float64)
+        except (TypeError, ValueError):
+            rest.extend(zip(exact_idx, exact_rows))  # au moins une valeur non numérique
+
+    for i, v in rest:
+        for j in range(min(len(v), n_out)):
+            try:
+                arr[i, j] = v[j]
+            except (TypeError, ValueError):
+                pass  # valeur non numérique -> reste NaN
+    return arr
 
 
 # ---------------------------------------------------------------------
@@ -108,16 +176,29 @@ def _pad_or_none(lst: Optional[List[Any]], n: int) -> List[Optional[Any]]:
 def convert_list_like_columns(
     df: pd.DataFrame,
     list_like_cols: Iterable[str] = DEFAULT_LIST_LIKE_COLS,
+    copy: bool = True,
+    n_jobs: int = 1,
 ) -> pd.DataFrame:
     """
     Convertit les colonnes list-like (stockées en str) en vraies listes Python.
     - Aucune imputation ni correction sémantique.
     - Les valeurs non convertibles deviennent None.
+    - copy=False : modifie df en place (le pipeline copie une seule fois en amont).
+    - n_jobs > 1 : une colonne par processus (ProcessPoolExecutor). À réserver à
+      l'ingestion initiale du CSV brut : le démarrage des processus et le transfert
+      des tableaux coûtent plus cher que le parsing sur de petits volumes.
     """
-    df = _copy(df)
-    for col in list_like_cols:
-        if col in df.columns:
-            df[col] = df[col].apply(_ensure_list_or_none)
+    if copy:
+        df = _copy(df)
+    cols = [c for c in list_like_cols if c in df.columns]
+    if n_jobs > 1 and len(cols) > 1:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(cols))) as ex:
+            futures = {c: ex.submit(_parse_list_array, df[c].to_numpy(dtype=object)) for c in cols}
+            for c, fut in futures.items():
+                df[c] = pd.Series(fut.result(), index=df.index, name=c)
+        return df
+    for col in cols:
+        df[col] = _parse_list_column(df[col])
     return df
 
 
@@ -126,27 +207,25 @@ def split_nutrition_columns(
     nutrition_col: str = "nutrition",
     output_cols: Sequence[str] = NUTRITION_COLS,
     drop_original: bool = False,
+    copy: bool = True,
 ) -> pd.DataFrame:
     """
     Découpe 'nutrition' (list[float] de longueur 7) en 7 colonnes nommées.
 
     - Si la ligne ne contient pas une liste -> NaN dans les colonnes créées.
-    - Si la liste n'est pas de longueur 7 -> pad/truncate à 7 avec None.
+    - Si la liste n'est pas de longueur 7 -> pad (NaN)/truncate à 7.
     - drop_original=True supprime la colonne 'nutrition' d'origine.
+    - copy=False : modifie df en place (le pipeline copie une seule fois en amont).
 
     Raises
     ------
     ValueError si une des colonnes cibles existe déjà pour éviter l'écrasement.
     """
-    df = _copy(df)
+    if copy:
+        df = _copy(df)
     if nutrition_col not in df.columns:
         return df
 
-    # Sécurité : convertir au bon format list/None AVANT de splitter
-    lists = df[nutrition_col].apply(_ensure_list_or_none)
-    padded = lists.apply(lambda x: _pad_or_none(x, len(output_cols)))
-    nutri_df = pd.DataFrame(padded.to_list(), columns=list(output_cols), index=df.index)
-
     # Vérifier collisions de noms
     dupes = [c for c in output_cols if c in df.columns]
     if dupes:
@@ -155,10 +234,11 @@ def split_nutrition_columns(
             "Renomme-les/supprime-les avant split_nutrition_columns()."
         )
 
-    out = pd.concat([df, nutri_df], axis=1)
-    if drop_original and nutrition_col in out.columns:
-        out = out.drop(columns=[nutrition_col])
-    return out
+    arr = _nutrition_array(df[nutrition_col].to_numpy(dtype=object), len(output_cols))
+    df[list(output_cols)] = arr
+    if drop_original:
+        df = df.drop(columns=[nutrition_col])
+    return df
 
 
 def convert_temporal_columns(
@@ -166,14 +246,20 @@ def convert_temporal_columns(
     submitted_col: str = "submitted",
     add_parts: bool = True,
     parts: Sequence[str] = ("year", "month"),
+    copy: bool = True,
 ) -> pd.DataFrame:
     """
-    Convertit 'submitted' en datetime (errors='coerce').
+    Convertit 'submitted' (ISO 'YYYY-MM-DD') en datetime (errors='coerce').
     Optionnel : ajoute des parties temporelles ('year', 'month', 'day', 'dayofweek', ...).
+    copy=False : modifie df en place (le pipeline copie une seule fois en amont).
     """
-    df = _copy(df)
+    if copy:
+        df = _copy(df)
     if submitted_col in df.columns:
-        df[submitted_col] = pd.to_datetime(df[submitted_col], errors="coerce")
+        # format ISO explicite : parseur C rapide (pas d'inférence élément par élément)
+        df[submitted_col] = pd.to_datetime(
+            df[submitted_col], format="ISO8601", errors="coerce", cache=True
+        )
         if add_parts:
             if "year" in parts:
                 df["year"] = df[submitted_col].dt.year
@@ -189,16 +275,47 @@ def convert_temporal_columns(
 def convert_contributor_to_category(
     df: pd.DataFrame,
     contributor_col: str = "contributor_id",
+    copy: bool = True,
 ) -> pd.DataFrame:
     """
     Convertit l'identifiant contributeur en catégoriel pour éviter des stats numériques absurdes.
+    No-op si la colonne est déjà catégorielle (ex: relue depuis un parquet de save_parquet).
+    copy=False : modifie df en place (le pipeline copie une seule fois en amont).
     """
-    df = _copy(df)
-    if contributor_col in df.columns:
+    if copy:
+        df = _copy(df)
+    if contributor_col in df.columns and not isinstance(df[contributor_col].dtype, pd.CategoricalDtype):
         df[contributor_col] = df[contributor_col].astype("category")
     return df
 
 
+def downcast_numeric_columns(
+    df: pd.DataFrame,
+    copy: bool = True,
+) -> pd.DataFrame:
+    """
+    Réduit les dtypes numériques numpy pour diviser par 2 la mémoire lue par les stats.
+    - int64/uint64 -> int32 si toutes les valeurs sont < _INT32_DOWNCAST_LIMIT en valeur
+      absolue (marge d'un facteur 2 ; on ne descend pas plus bas : évite les débordements
+      silencieux en arithmétique int8/int16/int32).
+    - float64 -> float32 (nutrition, year/month avec NaN, ...).
+    - bool, category, datetime et dtypes "extension" (Int64, Arrow, ...) : inchangés.
+    copy=False : modifie df en place (le pipeline copie une seule fois en amont).
+    """
+    if copy:
+        df = _copy(df)
+    for col in df.columns:
+        s = df[col]
+        if not isinstance(s.dtype, np.dtype) or s.dtype.itemsize <= 4:
+            continue
+        if s.dtype.kind in "iu":
+            if s.empty or (s.min() > -_INT32_DOWNCAST_LIMIT and s.max() < _INT32_DOWNCAST_LIMIT):
+                df[col] = s.astype(np.int32)
+        elif s.dtype.kind == "f":
+            df[col] = s.astype(np.float32)
+    return df
+
+
 # ---------------------------------------------------------------------
 # Pipeline de conversion (recettes, univariée)
 # ---------------------------------------------------------------------
@@ -213,6 +330,8 @@ class RecipeConversionConfig:
     temporal_parts: Tuple[str, ...] = ("year", "month")
     contributor_col: str = "contributor_id"
     drop_original_nutrition: bool = False
+    downcast_numeric: bool = True
+    n_jobs: int = 1
 
 
 def convert_recipes_for_univariate(
@@ -227,6 +346,7 @@ def convert_recipes_for_univariate(
       - découpe des 7 colonnes nutritionnelles (ajoutées à droite)
       - submitted -> datetime (+ colonnes temporelles choisies)
       - contributor_id -> category
+      - int64/float64 -> int32/float32 (si cfg.downcast_numeric)
 
     Exclus :
       - Pas d'imputation, pas de filtrage d'outliers, pas de features dérivées métier.
@@ -234,9 +354,12 @@ def convert_recipes_for_univariate(
     """
     cfg = config or RecipeConversionConfig()
 
+    # Une seule copie (superficielle) à l'entrée : les étapes travaillent ensuite en place
     df = _copy(df_recipes)
     # 1) Colonnes list-like en vraies listes
-    df = convert_list_like_columns(df, list_like_cols=cfg.list_like_cols)
+    df = convert_list_like_columns(
+        df, list_like_cols=cfg.list_like_cols, copy=False, n_jobs=cfg.n_jobs
+    )
     # 2) Nutrition -> colonnes dédiées
     if cfg.nutrition_col in df.columns:
         df = split_nutrition_columns(
@@ -244,6 +367,7 @@ def convert_recipes_for_univariate(
             nutrition_col=cfg.nutrition_col,
             output_cols=NUTRITION_COLS,
             drop_original=cfg.drop_original_nutrition,
+            copy=False,
         )
     # 3) Temps -> datetime (+ parts)
     df = convert_temporal_columns(
@@ -251,9 +375,13 @@ def convert_recipes_for_univariate(
         submitted_col=cfg.temporal_col,
         add_parts=cfg.add_temporal_parts,
         parts=cfg.temporal_parts,
+        copy=False,
     )
     # 4) Contributor -> category
-    df = convert_contributor_to_category(df, contributor_col=cfg.contributor_col)
+    df = convert_contributor_to_category(df, contributor_col=cfg.contributor_col, copy=False)
+    # 5) Dtypes numériques réduits (int32 / float32)
+    if cfg.downcast_numeric:
+        df = downcast_numeric_columns(df, copy=False)
 
     return df
 
@@ -270,6 +398,7 @@ def generate_auto_description(row: pd.Series) -> str:
     Notes :
     - Purement indicative (anglais simple), ne remplace pas un vrai texte marketing.
     - N'altère aucune autre colonne, à appeler via df.apply(generate_auto_description, axis=1).
+    - Sur un DataFrame complet, préférer generate_auto_descriptions(df) (vectorisée).
     """
     # 1) Si la description existe déjà, on la garde telle quelle
     desc = row.get("description", None)
@@ -323,5 +452,60 @@ def generate_auto_description(row: pd.Series) -> str:
     sentence = " ".join(parts).strip().capitalize()
     return (sentence + ".") if not sentence.endswith(".") else sentence
 
+
+def _column_or_nan(df: pd.DataFrame, col: str) -> pd.Series:
+    """Colonne si présente, sinon Series de NaN (équivalent vectorisé de row.get(col, None))."""
+    if col in df.columns:
+        return df[col]
+    return pd.Series(np.nan, index=df.index, dtype=object)
+
+
+def generate_auto_descriptions(df: pd.DataFrame) -> pd.Series:
+    """
+    Version vectorisée de generate_auto_description : une passe par colonne
+    au lieu de df.apply(..., axis=1) (qui matérialise une Series par ligne).
+
+    Renvoie une Series alignée sur df.index : description d'origine si non vide,
+    sinon la phrase générée (mêmes règles que la version ligne à ligne).
+    """
+    # astype(object) : .str refuse les colonnes float (ex. entièrement NaN)
+    desc = _column_or_nan(df, "description").astype(object)
+    is_str = desc.map(type).eq(str)
+    has_desc = is_str & desc.where(is_str, "").str.strip().ne("")
+
+    # Catégorie "naïve" depuis le 1er tag (listes non vides dont le 1er élément est une str)
+    tags = _column_or_nan(df, "tags").astype(object)
+    first = tags.where(tags.map(type).eq(list)).str[0]
+    first = first.where(first.map(type).eq(str), "")
+    category = first.str.replace("-", " ").str.strip()
+    cat_part = np.where(category.ne(""), " " + category, "")
+
+    # Temps
+    minutes = pd.to_numeric(_column_or_nan(df, "minutes"), errors="coerce")
+    time_part = np.select(
+        [minutes < 30, minutes < 90, minutes >= 90],
+        [" that is quick to prepare", " of moderate duration", " that takes longer to cook"],
+        default="",
+    )
+
+    # Complexité (seulement si les deux valeurs sont connues)
+    n_steps = pd.to_numeric(_column_or_nan(df, "n_steps"), errors="coerce")
+    n_ing = pd.to_numeric(_column_or_nan(df, "n_ingredients"), errors="coerce")
+    known = n_steps.notna() & n_ing.notna()
+    complexity_part = np.select(
+        [known & (n_steps <= 5) & (n_ing <= 5), known & ((n_steps > 10) | (n_ing > 10)), known],
+        [" and very simple to make", " and rather elaborate", " with average complexity"],
+        default="",
+    )
+
+    generated = (
+        "This is a"
+        + pd.Series(cat_part, index=df.index, dtype=object)
+        + " recipe"
+        + time_part
+        + complexity_part
+    ).str.capitalize() + "."
+    return desc.where(has_desc, generated)
+
 # (← ligne vide à la fin du fichier)
 
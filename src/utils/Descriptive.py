@@ -20,6 +20,10 @@ def _ensure_col(df: pd.DataFrame, col: str) -> None:
 def _is_numeric(s: pd.Series) -> bool:
     return pd.api.types.is_numeric_dtype(s)
 
+def _as_numeric(s: pd.Series) -> pd.Series:
+    """Série numérique : telle quelle si déjà numérique, sinon to_numeric(errors='coerce')."""
+    return s if _is_numeric(s) else pd.to_numeric(s, errors="coerce")
+
 def _is_categorical(s: pd.Series) -> bool:
     return pd.api.types.is_categorical_dtype(s) or pd.api.types.is_object_dtype(s) or pd.api.types.is_string_dtype(s)
 
@@ -32,23 +36,28 @@ def summarize_numeric(
 ) -> pd.DataFrame:
     """Résumé complet pour une variable quantitative."""
     _ensure_col(df, column)
-    s = pd.to_numeric(df[column], errors="coerce").dropna()
+    s = _as_numeric(df[column]).dropna()
+    n = s.size
+    # une seule passe de tri pour les quantiles (q1, q3 + percentiles) ; min/max/moyenne/
+    # écart-type/médiane restent calculés sur s (O(n), dtype d'origine : int, float32, ...)
+    probs = [0.25, 0.75, *percentiles]
+    qs = np.quantile(s.to_numpy(dtype=np.float64), probs) if n else np.full(len(probs), np.nan)
     out = {
-        "count": s.size,
+        "count": n,
         "missing": df[column].isna().sum(),
-        "min": s.min() if not s.empty else np.nan,
-        "q1": s.quantile(0.25) if not s.empty else np.nan,
-        "median": s.median() if not s.empty else np.nan,
-        "mean": s.mean() if not s.empty else np.nan,
-        "q3": s.quantile(0.75) if not s.empty else np.nan,
-        "max": s.max() if not s.empty else np.nan,
-        "std": s.std(ddof=1) if s.size > 1 else np.nan,
-        "skew": s.skew() if s.size > 2 else np.nan,
-        "kurtosis": s.kurt() if s.size > 3 else np.nan,
+        "min": s.min() if n else np.nan,
+        "q1": qs[0],
+        "median": s.median() if n else np.nan,
+        "mean": s.mean() if n else np.nan,
+        "q3": qs[1],
+        "max": s.max() if n else np.nan,
+        "std": s.std(ddof=1) if n > 1 else np.nan,
+        "skew": s.skew() if n > 2 else np.nan,
+        "kurtosis": s.kurt() if n > 3 else np.nan,
         "unique": s.nunique(),
     }
-    for p in percentiles:
-        out[f"p{int(p*100):02d}"] = s.quantile(p) if not s.empty else np.nan
+    for p, q in zip(percentiles, qs[2:]):
+        out[f"p{int(p*100):02d}"] = q
     return pd.DataFrame([out], index=[column])
 
 
@@ -74,8 +83,8 @@ def summarize_categorical(
 def summarize_num_num(df: pd.DataFrame, x: str, y: str) -> pd.DataFrame:
     """Numérique↔Numérique : corrélations / covariance."""
     _ensure_col(df, x); _ensure_col(df, y)
-    sx = pd.to_numeric(df[x], errors="coerce")
-    sy = pd.to_numeric(df[y], errors="coerce")
+    sx = _as_numeric(df[x])
+    sy = _as_numeric(df[y])
     mask = sx.notna() & sy.notna()
     sx, sy = sx[mask], sy[mask]
     if sx.empty:
@@ -93,8 +102,9 @@ def summarize_num_cat(
 ) -> pd.DataFrame:
     """Numérique↔Catégoriel : stats par catégorie (count, mean, median, std)."""
     _ensure_col(df, num_col); _ensure_col(df, cat_col)
-    g = df[[num_col, cat_col]].copy()
-    g[num_col] = pd.to_numeric(g[num_col], errors="coerce")
+    g = df[[num_col, cat_col]]
+    if not _is_numeric(g[num_col]):
+        g = g.assign(**{num_col: _as_numeric(g[num_col])})
     g = g.dropna(subset=[num_col, cat_col])
     top_cats = g[cat_col].value_counts().head(top_k).index
     g = g[g[cat_col].isin(top_cats)]
@@ -115,27 +125,39 @@ def summarize_cat_cat(df: pd.DataFrame, a: str, b: str, top_k: int = 20, normali
 
 
 # --- Analyse de colonnes LISTE (tags, ingredients, steps) ---
-from collections import Counter
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+def _arrow_list_counts(s: pd.Series) -> pd.Series:
+    """Comptage des éléments d'une colonne Arrow list<...> : list_flatten + value_counts natifs."""
+    vc = pc.value_counts(pc.list_flatten(pa.array(s)))
+    values, counts = vc.field("values"), vc.field("counts")
+    valid = values.is_valid()  # éléments null ignorés, comme value_counts() côté pandas
+    values, counts = values.filter(valid), counts.filter(valid)
+    out = pd.Series(counts.to_numpy(zero_copy_only=False), index=values.to_pandas(), name="count")
+    return out.sort_values(ascending=False, kind="stable")
 
 def analyze_list_column(df: pd.DataFrame, col_name: str, top_k: int = 10) -> pd.DataFrame:
     """
     Compte les occurrences des éléments dans une colonne de listes (ex: 'ingredients', 'tags').
     Retourne un DataFrame: élément | fréquence (trié décroissant).
-    suppose que df[col_name] contient déjà des listes Python (pas des str).
+    suppose que df[col_name] contient déjà des listes Python (pas des str)
+    ou est une colonne Arrow list<...>.
     """
     if col_name not in df.columns:
         raise KeyError(f"Colonne absente: {col_name}")
-    all_items = [
-        item
-        for sub in df[col_name].dropna()
-        if isinstance(sub, list)
-        for item in sub
-    ]
-    counter = Counter(all_items)
-    top = counter.most_common(top_k)
-    out = pd.DataFrame(top, columns=["element", "frequency"])
+    s = df[col_name]
+    if isinstance(s.dtype, pd.ArrowDtype) and pa.types.is_list(s.dtype.pyarrow_dtype):
+        # colonne Arrow (load_parquet_safe(..., dtype_backend="pyarrow")) : tout en kernels Arrow
+        counts = _arrow_list_counts(s)
+    else:
+        s = s[s.map(type).eq(list)]  # écarte aussi NaN/None : pas besoin d'un dropna() intermédiaire
+        # explode + value_counts : aplatissement et comptage en C (pas de double boucle Python).
+        # ignore_index=True : RangeIndex au lieu d'un index int64 répété par élément (mémoire).
+        counts = s.explode(ignore_index=True).value_counts()
+    out = counts.head(top_k).rename_axis("element").reset_index(name="frequency")
     out.index = range(1, len(out) + 1)
-    print(f"📊 '{col_name}': total={len(all_items):,} | uniques={len(counter):,}")
-    return out
-
+    print(f"📊 '{col_name}': total={int(counts.sum()):,} | uniques={counts.size:,}")
+    return out
\ No newline at end of file
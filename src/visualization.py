@@ -9,11 +9,16 @@ Fonctions Plotly pour:
 Chaque fonction retourne une figure Plotly (fig).
 Utilisation en notebook: fig.show()
 Utilisation en Streamlit: st.plotly_chart(fig)
+Cache optionnel des figures : plot_*(..., use_cache=True), pour un DataFrame non modifié en place.
 """
 
 from __future__ import annotations
 
-from typing import Iterable, Optional, Sequence, Tuple
+import functools
+import weakref
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Callable, Hashable, Iterable, Optional, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
@@ -24,29 +29,435 @@ import plotly.graph_objects as go
 # ---------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------
+#: Au-delà de ce nombre de points, les nuages sont tracés en WebGL (Scattergl)
+_WEBGL_MIN_POINTS = 2000
+
+def _f32(arr: np.ndarray) -> np.ndarray:
+    """
+    Tableau float32 contigu pour Plotly : deux fois moins d'octets à encoder et transférer,
+    précision largement suffisante à l'écran (les calculs restent en float64 en amont).
+    """
+    return np.ascontiguousarray(arr, dtype=np.float32)
+
 def _ensure_cols(df: pd.DataFrame, cols: Iterable[str]) -> None:
-    missing = [c for c in cols if c not in df.columns]
+    # Index.__contains__ = table de hachage déjà en cache : un frozenset serait plus lent.
+    # Vérification faite une seule fois par fonction publique, jamais dans les helpers.
+    columns = df.columns
+    missing = [c for c in cols if c not in columns]
     if missing:
         raise KeyError(f"Colonnes absentes: {missing}")
 
-def _select_top_k_categories(
-    df: pd.DataFrame, col: str, top_k: int
-) -> pd.DataFrame:
+def _top_k_codes(counts: np.ndarray, top_k: int, order: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Codes des top_k effectifs les plus élevés, par effectif décroissant ; à effectif égal,
+    dans l'ordre `order` (codes croissants par défaut). Tri stable sur les seules modalités :
+    sélection déterministe, là où le quicksort de value_counts ne garantit pas l'ordre des ex aequo.
+    """
+    if order is None:
+        order = np.arange(counts.size)
+    return order[np.argsort(-counts[order], kind="stable")[:max(top_k, 0)]]
+
+def _top_k_masked(
+    codes: np.ndarray, m: np.ndarray, ncat: int, top_k: int, categorical: bool = False
+) -> np.ndarray:
+    """
+    Codes des top_k modalités les plus fréquentes parmi les lignes m, comme
+    value_counts().head(top_k) sur ces lignes : à effectif égal, ordre des catégories pour
+    un Categorical, sinon ordre de première apparition parmi les lignes m.
+    """
+    if top_k >= ncat:
+        return np.arange(ncat)
+    sub = codes[m]
+    counts = np.bincount(sub, minlength=ncat)
+    return _top_k_codes(counts, top_k, None if categorical else pd.unique(sub))
+
+def _sorted_codes(codes: np.ndarray, uniques: pd.Index, categorical: bool = False) -> np.ndarray:
+    """
+    Trie des codes dans l'ordre de pd.crosstab : ordre des catégories pour un Categorical
+    (les codes le suivent déjà), sinon ordre des libellés ; ordre inchangé si non comparables.
+    """
+    if categorical:
+        return np.sort(codes)
+    try:
+        return codes[np.argsort(np.asarray(uniques[codes]), kind="stable")]
+    except TypeError:
+        return codes
+
+def _factorize(s: pd.Series, use_na_sentinel: bool = True) -> Tuple[np.ndarray, pd.Index]:
+    """
+    pd.factorize, sans hachage pour un Categorical : ses codes et catégories sont repris tels
+    quels (modalités absentes comprises, d'effectif nul). Sans sentinelle, NaN = dernier code.
+    """
+    if not isinstance(s.dtype, pd.CategoricalDtype):
+        codes, uniques = pd.factorize(s, use_na_sentinel=use_na_sentinel)
+        return codes, pd.Index(uniques)
+    codes = s.cat.codes.to_numpy()
+    uniques = s.cat.categories
+    if not use_na_sentinel and (codes < 0).any():
+        codes = np.where(codes < 0, len(uniques), codes)
+        uniques = uniques.insert(len(uniques), np.nan)
+    return codes, uniques
+
+
+def _top_k_counts(df: pd.DataFrame, col: str, top_k: int) -> Tuple[pd.Index, np.ndarray]:
+    """
+    Top_k modalités (NaN compris) et leurs effectifs, par ordre décroissant : équivalent de
+    df[col].value_counts(dropna=False).head(top_k) via factorize + bincount + tri stable,
+    ex aequo dans l'ordre d'apparition (ordre des catégories pour un Categorical).
+    """
+    uniques, counts = _column_counts(df, col)
+    # modalités déjà dans l'ordre de départage de value_counts (voir _column_counts)
+    top = _top_k_codes(counts, top_k)
+    return uniques[top], counts[top]
+
+def _sorted_groups(values: np.ndarray, codes: np.ndarray, ncat: int) -> list:
+    """
+    Valeurs triées de chaque catégorie (codes entiers 0..ncat-1).
+    Regroupement par un argsort stable des codes (petits entiers : tri radix), puis tri
+    de chaque segment : bien plus rapide qu'un lexsort (code, valeur) sur N lignes.
+    """
+    if ncat == 0:
+        return []
+    v = values[np.argsort(codes, kind="stable")]
+    bounds = np.cumsum(np.bincount(codes, minlength=ncat))[:-1]
+    return [np.sort(seg) for seg in np.split(v, bounds)]
+
+def _box_stats(groups: list) -> Tuple[dict, list]:
+    """
+    Statistiques de boxplot par catégorie, à partir des segments triés de _sorted_groups.
+    - Moustaches à la Plotly : valeurs extrêmes restant dans [Q1 - 1.5·IQR, Q3 + 1.5·IQR].
+    Retourne ({q1, median, q3, lowerfence, upperfence} -> ndarray[ncat], outliers par catégorie).
     """
-    Garde uniquement les top_k modalités les plus fréquentes (autres supprimées).
+    ncat = len(groups)
+    stats = {k: np.full(ncat, np.nan) for k in ("q1", "median", "q3", "lowerfence", "upperfence")}
+    outliers = []
+    for c, seg in enumerate(groups):
+        if seg.size == 0:
+            outliers.append(seg)
+            continue
+        q1, med, q3 = np.quantile(seg, [0.25, 0.5, 0.75])
+        iqr = q3 - q1
+        lo = seg[np.searchsorted(seg, q1 - 1.5 * iqr, side="left")]
+        hi = seg[np.searchsorted(seg, q3 + 1.5 * iqr, side="right") - 1]
+        stats["q1"][c], stats["median"][c], stats["q3"][c] = q1, med, q3
+        stats["lowerfence"][c], stats["upperfence"][c] = lo, hi
+        outliers.append(seg[(seg < lo) | (seg > hi)])
+    return stats, outliers
+
+def _kde(groups: list, n_grid: int = 256) -> list:
+    """
+    Densité gaussienne par catégorie (segments triés et finis de _sorted_groups), comme go.Violin :
+    bande passante de Silverman, support [min - 2h, max + 2h].
+    Estimation « binned » : histogramme sur n_grid points puis convolution par le noyau
+    échantillonné, soit O(n + n_grid²) par catégorie au lieu de O(n · n_grid).
+    Retourne [(grille, densité)] par catégorie (tableaux vides si catégorie vide).
     """
-    counts = df[col].value_counts(dropna=False)
-    keep = counts.head(top_k).index
-    return df[df[col].isin(keep)].copy()
+    out = []
+    for seg in groups:
+        if seg.size == 0:
+            out.append((seg, seg))
+            continue
+        q1, q3 = np.quantile(seg, [0.25, 0.75])
+        std = seg.std(ddof=1) if seg.size > 1 else 0.0
+        spread = min(std, (q3 - q1) / 1.349) or std or max(abs(seg[0]), 1.0) * 1e-3
+        h = 1.059 * spread * seg.size ** -0.2
+        grid = np.linspace(seg[0] - 2 * h, seg[-1] + 2 * h, n_grid)
+        dx = grid[1] - grid[0]
+        hist = np.bincount(np.rint((seg - grid[0]) / dx).astype(np.intp), minlength=n_grid)
+        half = min(int(np.ceil(4 * h / dx)), n_grid)
+        kernel = np.exp(-0.5 * (np.arange(-half, half + 1) * dx / h) ** 2)
+        # convolution complète recentrée : n_grid points quel que soit le rayon du noyau
+        # (mode="same" rend max(n_grid, 2·half + 1) points pour les petits groupes)
+        dens = np.convolve(hist, kernel)[half:half + n_grid] / (seg.size * h * np.sqrt(2 * np.pi))
+        out.append((grid, dens))
+    return out
 
-def _numeric_series(df: pd.DataFrame, col: str) -> pd.Series:
-    s = pd.to_numeric(df[col], errors="coerce")
-    return s.dropna()
+def _minmax_indices(x: np.ndarray, y: np.ndarray, n_buckets: int) -> np.ndarray:
+    """
+    Indices des points min et max de y dans chacune des n_buckets tranches de x
+    de même largeur (principe M4 : une tranche ~ une colonne de pixels).
+    Conserve l'enveloppe et les queues ; groupby idxmin/idxmax en O(N), sans tri.
+    """
+    lo, hi = x.min(), x.max()
+    if hi <= lo:
+        bucket = np.zeros(x.size, dtype=np.intp)
+    else:
+        bucket = np.minimum(((x - lo) * (n_buckets / (hi - lo))).astype(np.intp), n_buckets - 1)
+    g = pd.Series(y).groupby(bucket)
+    return np.unique(np.r_[g.idxmin().to_numpy(), g.idxmax().to_numpy()])
+
+def _downsample_xy(x: np.ndarray, y: np.ndarray, n_out: int, seed: int = 42) -> np.ndarray:
+    """
+    Indices (triés) d'au plus n_out points du nuage (x, y) :
+    - moitié du budget : min/max de y par tranche de x (extrêmes, forme du nuage) ;
+    - reste : tirage uniforme parmi les autres points (densité).
+    """
+    n = x.size
+    if n <= n_out:
+        return np.arange(n)
+    ext = _minmax_indices(x, y, max(n_out // 4, 1))
+    rest = np.ones(n, dtype=bool)
+    rest[ext] = False
+    rest = np.flatnonzero(rest)
+    rng = np.random.default_rng(seed)
+    fill = rng.choice(rest, size=min(n_out - ext.size, rest.size), replace=False)
+    return np.sort(np.concatenate([ext, fill]))
+
+# ---------------------------------------------------------------------
+# Caches (figures, colonnes)
+# ---------------------------------------------------------------------
+#: Nombre maximal de figures gardées en mémoire (LRU, appels avec use_cache=True)
+_FIG_CACHE_SIZE = 64
+_fig_cache: "OrderedDict[Hashable, Tuple[weakref.ref, tuple, go.Figure]]" = OrderedDict()
+#: Nombre maximal de tableaux par colonne (valeurs numériques, codes, effectifs) gardés (LRU)
+_COL_CACHE_SIZE = 32
+_col_cache: "OrderedDict[Hashable, Tuple[weakref.ref, tuple, Any]]" = OrderedDict()
+#: Cache de colonnes actif : _col_cache (use_cache=True), dict propre à l'appel sinon
+_col_scope: ContextVar[Optional[dict]] = ContextVar("_col_scope", default=None)
+
+
+def _evict(cache: OrderedDict, ref: weakref.ref) -> None:
+    """Retire les entrées qui dépendent d'un objet libéré (df ou tableau de colonne)."""
+    for key in tuple(cache):
+        hit = cache.get(key)
+        if hit is not None and (hit[0] is ref or ref in hit[1]):
+            cache.pop(key, None)
+
+
+def _ref(obj: Any, cache: OrderedDict) -> Callable[[], Any]:
+    """
+    Référence faible qui purge le cache à la libération de l'objet (les figures et
+    tableaux ne survivent pas au DataFrame) ; référence forte si obj n'est pas
+    référençable faiblement (il reste alors vivant dans le cache).
+    """
+    try:
+        return weakref.ref(obj, functools.partial(_evict, cache))
+    except TypeError:
+        return lambda: obj
+
+
+def _lru_get(cache: OrderedDict, key: Hashable, df: pd.DataFrame, owners: tuple) -> Any:
+    """
+    Entrée du cache si elle a été calculée sur ce même df ET sur ces mêmes tableaux de
+    colonnes, sinon None. Les id() / adresses de la clé peuvent être réutilisés une fois
+    l'objet libéré : seules les références faibles garantissent l'identité.
+    """
+    hit = cache.get(key)
+    if hit is None or hit[0]() is not df or len(hit[1]) != len(owners):
+        return None
+    if any(r() is not o for r, o in zip(hit[1], owners)):
+        return None
+    cache.move_to_end(key)
+    return hit[2]
+
+
+def _lru_put(
+    cache: OrderedDict, key: Hashable, df: pd.DataFrame, owners: tuple, value: Any, maxsize: int
+) -> None:
+    cache[key] = (_ref(df, cache), tuple(_ref(o, cache) for o in owners), value)
+    if len(cache) > maxsize:
+        cache.popitem(last=False)
+
+
+def _column_token(s: pd.Series) -> Tuple[Hashable, Any]:
+    """
+    Empreinte O(1) d'une colonne et objet qui possède ses données : tableau NumPy racine
+    (bloc pandas) pour un dtype NumPy, ExtensionArray sinon. Une colonne réaffectée
+    (df[col] = ...) a un nouveau propriétaire, même si l'adresse mémoire est recyclée.
+    """
+    if isinstance(s.dtype, np.dtype):
+        arr = s.to_numpy(copy=False)
+        owner = arr
+        while isinstance(owner.base, np.ndarray):
+            owner = owner.base
+        return (s.dtype.str, id(owner), arr.__array_interface__["data"][0]), owner
+    owner = s.array
+    return (str(s.dtype), id(owner)), owner
+
+
+def _cache_key(
+    func: Callable, df: pd.DataFrame, args: tuple, kwargs: dict
+) -> Tuple[Optional[Hashable], tuple]:
+    """
+    Clé (fonction, df, colonnes utilisées, paramètres) et propriétaires des colonnes
+    utilisées ; clé None si un paramètre n'est pas hashable.
+    """
+    params = args + tuple(sorted(kwargs.items()))
+    try:
+        hash(params)
+    except TypeError:
+        return None, ()
+    columns = df.columns
+    tokens = [(c, *_column_token(df[c])) for c in args + tuple(kwargs.values())
+              if isinstance(c, str) and c in columns]
+    used = tuple((c, token) for c, token, _ in tokens)
+    owners = tuple(owner for _, _, owner in tokens)
+    return (func.__qualname__, id(df), df.shape, used, params), owners
+
+
+def _cached_figure(func: Callable[..., go.Figure]) -> Callable[..., go.Figure]:
+    """
+    Ajoute use_cache (False par défaut) à une fonction plot_*(df, ...).
+    - use_cache=False : figure recalculée à chaque appel ; conversions de colonnes
+      partagées seulement au sein de l'appel.
+    - use_cache=True : un appel répété avec le même df et les mêmes paramètres (ex. slider
+      Streamlit qui revient sur une valeur) renvoie une copie de la figure déjà construite,
+      et les conversions de colonnes sont partagées entre les graphiques.
+    Avec use_cache=True, une colonne remplacée (df[col] = ...) invalide l'entrée, mais une
+    modification en place des valeurs (df.loc[...] = ..., inplace=True) n'est PAS détectée :
+    réserver use_cache aux DataFrames figés, ou appeler clear_figure_cache() après l'édition.
+    """
+    @functools.wraps(func)
+    def wrapper(df: pd.DataFrame, *args: Any, use_cache: bool = False, **kwargs: Any) -> go.Figure:
+        if not use_cache:
+            scope = _col_scope.set({})
+            try:
+                return func(df, *args, **kwargs)
+            finally:
+                _col_scope.reset(scope)
+
+        key, owners = _cache_key(func, df, args, kwargs)
+        fig = _lru_get(_fig_cache, key, df, owners) if key is not None else None
+        if fig is None:
+            scope = _col_scope.set(_col_cache)
+            try:
+                fig = func(df, *args, **kwargs)
+            finally:
+                _col_scope.reset(scope)
+            if key is not None:
+                _lru_put(_fig_cache, key, df, owners, fig, _FIG_CACHE_SIZE)
+        # copie rendue : l'appelant peut modifier sa figure sans altérer le cache
+        return go.Figure(fig)
+
+    return wrapper
+
+
+def _cached_column(func: Callable[[pd.DataFrame, str], Any]) -> Callable[[pd.DataFrame, str], Any]:
+    """
+    Mémoïse un calcul func(df, col) par (df, colonne) dans le cache actif (_col_scope) :
+    conversion numérique, codes et effectifs d'une colonne calculés une seule fois par
+    appel de plot_*, ou partagés entre graphiques avec use_cache=True (même invalidation
+    que le cache des figures). Hors d'un plot_*, calcul direct sans cache.
+    Résultat partagé, à ne pas modifier en place.
+    """
+    @functools.wraps(func)
+    def wrapper(df: pd.DataFrame, col: str) -> Any:
+        cache = _col_scope.get()
+        if cache is None:
+            return func(df, col)
+        token, owner = _column_token(df[col])
+        key = func.__qualname__, id(df), col, token
+        if cache is not _col_cache:
+            # cache propre à l'appel : df et colonnes restent vivants jusqu'à la fin de l'appel
+            if key not in cache:
+                cache[key] = func(df, col)
+            return cache[key]
+        value = _lru_get(cache, key, df, (owner,))
+        if value is None:
+            value = func(df, col)
+            _lru_put(cache, key, df, (owner,), value, _COL_CACHE_SIZE)
+        return value
+
+    return wrapper
+
+
+def clear_figure_cache() -> None:
+    """Vide les caches de use_cache=True (figures et colonnes), ex. après une modification en place d'un DataFrame."""
+    _fig_cache.clear()
+    _col_cache.clear()
+
+
+@_cached_column
+def _numeric_array(df: pd.DataFrame, col: str) -> np.ndarray:
+    """Colonne en float64 de même longueur (NaN si manquant / non numérique)."""
+    s = df[col]
+    if pd.api.types.is_numeric_dtype(s.dtype):
+        # déjà numérique : vue sans copie pour float64, conversion directe sinon
+        return s.to_numpy(dtype=np.float64, na_value=np.nan)
+    return pd.to_numeric(s, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+@_cached_column
+def _column_codes(df: pd.DataFrame, col: str) -> Tuple[np.ndarray, pd.Index]:
+    """Codes entiers (NaN -> -1) et modalités d'une colonne (voir _factorize)."""
+    return _factorize(df[col])
+
+
+@_cached_column
+def _column_counts(df: pd.DataFrame, col: str) -> Tuple[pd.Index, np.ndarray]:
+    """
+    Effectifs de toutes les modalités d'une colonne, dans l'ordre de départage de
+    value_counts(dropna=False) : ordre d'apparition (catégories d'un Categorical, NaN en
+    dernier). Libellés des manquants comme value_counts : valeur d'origine (None, NaN, <NA>,
+    NaT), une entrée par sorte pour une colonne object, sinon le NA du dtype.
+    """
+    codes, uniques = _column_codes(df, col)
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    if counts.sum() == codes.size:
+        return uniques, counts
+    if isinstance(df[col].dtype, pd.CategoricalDtype):
+        # Categorical : value_counts range NaN après les catégories
+        return uniques.insert(len(uniques), np.nan), np.append(counts, codes.size - counts.sum())
+
+    na_rows = np.flatnonzero(codes < 0)
+    if df[col].dtype == object:
+        # manquants seuls (petit sous-ensemble), regroupés par libellé : None et NaN distincts
+        # (sans l'inférence de dtype que value_counts applique à leur index)
+        na = df[col].to_numpy()[na_rows]
+        _, first, n_na = np.unique(na.astype(str), return_index=True, return_counts=True)
+        order = np.argsort(first)
+        labels, first, n_na = na[first[order]], na_rows[first[order]], n_na[order]
+    else:
+        labels, first, n_na = [np.nan], na_rows[:1], [na_rows.size]
+    # chaque manquant inséré à son rang de première apparition (codes de factorize croissants
+    # dans l'ordre d'apparition) : le tri stable par effectif départage alors comme value_counts
+    for k, (label, f, n) in enumerate(zip(labels, first, n_na)):
+        pos = int(codes[:f].max()) + 1 + k if f else k
+        uniques = uniques.insert(pos, label)
+        counts = np.insert(counts, pos, n)
+    return uniques, counts
+
+
+def _numeric_values(df: pd.DataFrame, col: str) -> np.ndarray:
+    """
+    Valeurs numériques finies d'une colonne : NaN et ±inf retirés (Plotly ne les trace pas,
+    et np.histogram refuse une plage infinie).
+    """
+    arr = _numeric_array(df, col)
+    return arr[np.isfinite(arr)]
+
+
+def _top_k_groups(
+    df: pd.DataFrame, num_col: str, cat_col: str, top_k: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Valeurs finies de num_col restreintes aux top_k modalités de cat_col (lignes où les deux
+    sont renseignés), codes 0..K-1 (ordre de première apparition) et libellés des K modalités.
+    Un seul masque et une seule compaction des tableaux : ni copie ni DataFrame intermédiaire.
+    Comptage (bincount + tri stable) évité si la colonne a au plus top_k modalités.
+    """
+    num = _numeric_array(df, num_col)
+    codes, uniques = _column_codes(df, cat_col)
+    # valeurs finies seulement : ±inf (que Plotly ne trace pas) fausserait quartiles et KDE
+    m = (codes >= 0) & np.isfinite(num)
+    if top_k < len(uniques):
+        keep = np.zeros(len(uniques) + 1, dtype=bool)  # case finale (code -1) toujours False
+        keep[_top_k_masked(
+            codes, m, len(uniques), top_k, isinstance(df[cat_col].dtype, pd.CategoricalDtype)
+        )] = True
+        m &= keep[codes]
+    values, codes = num[m], codes[m]
+
+    order = pd.unique(codes)
+    remap = np.empty(len(uniques), dtype=np.intp)
+    remap[order] = np.arange(order.size)
+    return values, remap[codes], np.asarray(uniques[order].astype(str))
 
 
 # ---------------------------------------------------------------------
 # UNIVARIÉ — Quantitatif
 # ---------------------------------------------------------------------
+@_cached_figure
 def plot_hist_interactive(
     df: pd.DataFrame,
     col: str,
@@ -61,21 +472,38 @@ def plot_hist_interactive(
     - log_x: échelle log sur X
     """
     _ensure_cols(df, [col])
-    s = _numeric_series(df, col)
+    arr = _numeric_values(df, col)
     if max_x is not None:
-        s = s[s <= max_x]
+        arr = arr[arr <= max_x]
 
-    fig = px.histogram(
-        s, x=s, nbins=bins,
-        title=title or f"Distribution de {col}",
-        labels={"x": col, "y": "Count"},
-    )
+    # Binning côté Python (np.histogram) : la figure transporte `bins` barres, pas N valeurs
+    if log_x:
+        arr = arr[arr > 0]
+        edges = (
+            np.logspace(np.log10(arr.min()), np.log10(arr.max()), bins + 1)
+            if arr.size else bins
+        )
+        counts, edges = np.histogram(arr, bins=edges)
+        # centres géométriques ; largeur par défaut = espacement régulier en échelle log
+        bar = go.Bar(x=_f32(np.sqrt(edges[:-1] * edges[1:])), y=counts)
+    else:
+        counts, edges = np.histogram(arr, bins=bins)
+        bar = go.Bar(x=_f32(0.5 * (edges[:-1] + edges[1:])), y=counts, width=_f32(np.diff(edges)))
+
+    fig = go.Figure(bar)
     if log_x:
         fig.update_xaxes(type="log")
-    fig.update_layout(template="plotly_white", bargap=0.05)
+    fig.update_layout(
+        title=title or f"Distribution de {col}",
+        xaxis_title=col,
+        yaxis_title="Count",
+        template="plotly_white",
+        bargap=0.05,
+    )
     return fig
 
 
+@_cached_figure
 def plot_box_interactive(
     df: pd.DataFrame,
     col: str,
@@ -89,21 +517,27 @@ def plot_box_interactive(
     - showfliers: afficher/masquer les points extrêmes
     """
     _ensure_cols(df, [col])
-    s = _numeric_series(df, col)
-    fig = px.box(
-        x=s, points="all" if showfliers else False,
-        title=title or f"Boxplot de {col}",
-        labels={"x": col},
-    )
+    s = _numeric_values(df, col)
+    # tableau NumPy contigu -> sérialisé en binaire typé par Plotly (pas de liste Python)
+    fig = go.Figure(go.Box(
+        x=_f32(s), boxpoints="all" if showfliers else False, name=col, showlegend=False,
+        marker_color=px.colors.qualitative.Plotly[0],
+    ))
     if max_x is not None:
         fig.update_xaxes(range=[float(np.nanmin(s)), max_x])
-    fig.update_layout(template="plotly_white")
+    fig.update_layout(
+        title=title or f"Boxplot de {col}",
+        xaxis_title=col,
+        template="plotly_white",
+    )
+    fig.update_yaxes(showticklabels=False)
     return fig
 
 
 # ---------------------------------------------------------------------
 # UNIVARIÉ — Qualitatif
 # ---------------------------------------------------------------------
+@_cached_figure
 def plot_bar_categorical(
     df: pd.DataFrame,
     col: str,
@@ -119,21 +553,30 @@ def plot_bar_categorical(
     - rotate: angle des labels en X
     """
     _ensure_cols(df, [col])
-    counts = df[col].value_counts(dropna=False).head(top_k)
-    y_vals = counts / counts.sum() if normalize and counts.sum() > 0 else counts
+    labels, counts = _top_k_counts(df, col, top_k)
+    y_vals = counts
+    if normalize:
+        # proportions en place dans un unique tampon float32 (total nul -> zéros)
+        total = counts.sum()
+        y_vals = counts.astype(np.float32)
+        np.divide(y_vals, total, out=y_vals, where=total > 0)
     y_title = "Proportion" if normalize else "Effectif"
 
-    fig = px.bar(
-        x=counts.index.astype(str),
-        y=y_vals.values,
+    fig = go.Figure(go.Bar(
+        x=np.asarray(labels.astype(str)), y=y_vals,
+        marker_color=px.colors.qualitative.Plotly[0],
+    ))
+    fig.update_layout(
         title=title or f"Top-{top_k} modalités de {col}",
-        labels={"x": col, "y": y_title},
+        xaxis_title=col,
+        yaxis_title=y_title,
+        template="plotly_white",
     )
-    fig.update_layout(template="plotly_white")
     fig.update_xaxes(tickangle=rotate)
     return fig
 
 
+@_cached_figure
 def plot_pie_categorical(
     df: pd.DataFrame,
     col: str,
@@ -145,19 +588,71 @@ def plot_pie_categorical(
     Attention: privilégier bar chart pour comparer finement.
     """
     _ensure_cols(df, [col])
-    counts = df[col].value_counts(dropna=False).head(top_k)
-    fig = px.pie(
-        names=counts.index.astype(str),
-        values=counts.values,
+    labels, counts = _top_k_counts(df, col, top_k)
+    fig = go.Figure(go.Pie(labels=np.asarray(labels.astype(str)), values=counts))
+    fig.update_layout(
         title=title or f"Répartition (Top-{top_k}) de {col}",
+        template="plotly_white",
     )
-    fig.update_layout(template="plotly_white")
     return fig
 
 
 # ---------------------------------------------------------------------
 # BIVARIÉ — Quantitatif ↔ Quantitatif
 # ---------------------------------------------------------------------
+def _loess_binned(
+    x: np.ndarray, y: np.ndarray, nbins: int = 80, frac: float = 2 / 3
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Lissage local linéaire (type LOESS) sur nbins tranches de x à effectifs égaux.
+    Chaque tranche est résumée par ses sommes (n, Σx, Σy, Σx², Σxy) ; la droite au centre
+    d'une tranche est une régression pondérée (tricube) sur les ceil(frac·nbins) tranches
+    voisines. Tri O(N log N) puis calcul en O(nbins²) : utilisable sur toutes les données,
+    là où le LOWESS de statsmodels est quadratique en N (pas d'itérations robustes ici).
+    """
+    order = np.argsort(x, kind="stable")
+    x0 = x.mean()
+    xs, ys = x[order] - x0, y[order]  # centré : limite les pertes de précision sur Σx²
+    starts = np.unique(np.linspace(0, xs.size, min(nbins, xs.size) + 1).astype(np.intp)[:-1])
+    cnt = np.diff(np.append(starts, xs.size)).astype(np.float64)
+    sx = np.add.reduceat(xs, starts)
+    sy = np.add.reduceat(ys, starts)
+    sxx = np.add.reduceat(xs * xs, starts)
+    sxy = np.add.reduceat(xs * ys, starts)
+    centers = sx / cnt
+
+    dist = np.abs(centers[:, None] - centers[None, :])
+    q = min(max(int(np.ceil(frac * centers.size)), 2), centers.size)
+    h = np.partition(dist, q - 1, axis=1)[:, q - 1]
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        u = np.clip(dist / np.maximum(h, np.finfo(np.float64).tiny)[:, None], 0.0, 1.0)
+    w = (1.0 - u ** 3) ** 3
+
+    w0, w1, w2 = w @ cnt, w @ sx, w @ sxx
+    wy, wxy = w @ sy, w @ sxy
+    den = w0 * w2 - w1 * w1
+    ok = den > 1e-12 * w0 * w2
+    slope = np.divide(w0 * wxy - w1 * wy, den, out=np.zeros_like(den), where=ok)
+    intercept = (wy - slope * w1) / w0
+    return centers + x0, intercept + slope * centers
+
+
+def _trend_xy(xv: np.ndarray, yv: np.ndarray, kind: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """Courbe de tendance (x, y) : 'ols' via np.polyfit, 'lowess' via _loess_binned."""
+    if kind == "ols":
+        if xv.size < 2 or np.ptp(xv) == 0:
+            return None
+        slope, intercept = np.polyfit(xv, yv, 1)
+        xs = np.array([xv.min(), xv.max()])
+        return xs, slope * xs + intercept
+    if kind == "lowess":
+        if xv.size < 2:
+            return None
+        return _loess_binned(xv, yv)
+    raise ValueError(f"trendline invalide : {kind!r} (attendu 'ols', 'lowess' ou None)")
+
+
+@_cached_figure
 def plot_scatter_num_num(
     df: pd.DataFrame,
     x: str,
@@ -171,32 +666,72 @@ def plot_scatter_num_num(
     """
     Scatter interactif entre deux variables quantitatives.
     - color: variable optionnelle pour colorer les points (ex. rating_class)
-    - sample: sous-échantillonnage aléatoire si dataset très grand
-    - trendline: 'ols' (linéaire) ou 'lowess' (lissage local), None pour désactiver
+    - sample: nombre max de points affichés si dataset très grand
+      (min/max par tranche de x + tirage uniforme : extrêmes et forme du nuage conservés)
+    - trendline: 'ols' (linéaire) ou 'lowess' (lissage local), None pour désactiver ;
+      ajustée sur toutes les observations valides, pas seulement les points affichés
     """
     _ensure_cols(df, [x, y] + ([color] if color else []))
-    d = df[[x, y] + ([color] if color else [])].copy()
-    d[x] = pd.to_numeric(d[x], errors="coerce")
-    d[y] = pd.to_numeric(d[y], errors="coerce")
-    d = d.dropna(subset=[x, y])
+    xa = _numeric_array(df, x)
+    ya = _numeric_array(df, y)
+    rows = np.flatnonzero(~(np.isnan(xa) | np.isnan(ya)))
+    xa, ya = xa[rows], ya[rows]
 
-    if sample and len(d) > sample:
-        d = d.sample(sample, random_state=42)
+    # keep : positions (dans les lignes valides) des points affichés
+    keep = _downsample_xy(xa, ya, sample) if sample and rows.size > sample else np.arange(rows.size)
+    xv, yv = xa[keep], ya[keep]
 
-    fig = px.scatter(
-        d, x=x, y=y, color=color, opacity=opacity,
+    # WebGL au-delà de quelques milliers de points : le rendu SVG s'effondre vers ~10k
+    trace = go.Scattergl if keep.size > _WEBGL_MIN_POINTS else go.Scatter
+    marker = dict(size=6, line=dict(width=0))
+    fig = go.Figure()
+
+    def add_group(m: Optional[np.ndarray], name: Optional[str], group_color: Optional[str]) -> None:
+        # m : masque sur les lignes valides (None = toutes)
+        gx, gy = (xv, yv) if m is None else (xv[m[keep]], yv[m[keep]])
+        gx, gy = _f32(gx), _f32(gy)
+        fig.add_trace(trace(
+            x=gx, y=gy, mode="markers", name=name, legendgroup=name, showlegend=name is not None,
+            opacity=opacity, marker=dict(marker, color=group_color),
+        ))
+        tx, ty = (xa, ya) if m is None else (xa[m], ya[m])
+        curve = _trend_xy(tx, ty, trendline) if trendline else None
+        if curve is not None:
+            fig.add_trace(trace(
+                x=_f32(curve[0]), y=_f32(curve[1]), mode="lines", name=name, legendgroup=name,
+                showlegend=False, line=dict(color=group_color),
+            ))
+
+    palette = px.colors.qualitative.Plotly
+    if color and not pd.api.types.is_numeric_dtype(df[color].dtype):
+        # couleur discrète : une trace (et une tendance) par modalité, comme px.scatter
+        codes, cats = _factorize(pd.Series(df[color].array[rows]), use_na_sentinel=False)
+        for k, cat in enumerate(cats):
+            add_group(codes == k, str(cat), palette[k % len(palette)])
+        fig.update_layout(legend_title_text=color)
+    elif color:
+        add_group(None, None, palette[0])
+        fig.update_traces(
+            selector=dict(mode="markers"),
+            marker=dict(color=_f32(_numeric_array(df, color)[rows[keep]]), coloraxis="coloraxis"),
+        )
+        fig.update_layout(coloraxis_colorbar_title_text=color)
+    else:
+        add_group(None, None, palette[0])
+
+    fig.update_layout(
         title=title or f"{y} ~ {x}",
-        trendline=trendline,
-        labels={x: x, y: y},
+        xaxis_title=x,
+        yaxis_title=y,
+        template="plotly_white",
     )
-    fig.update_traces(marker=dict(size=6, line=dict(width=0)))
-    fig.update_layout(template="plotly_white")
     return fig
 
 
 # ---------------------------------------------------------------------
 # BIVARIÉ — Quantitatif ↔ Qualitatif
 # ---------------------------------------------------------------------
+@_cached_figure
 def plot_box_num_by_cat(
     df: pd.DataFrame,
     num_col: str,
@@ -211,21 +746,29 @@ def plot_box_num_by_cat(
     - showfliers=False: plus lisible quand les catégories sont nombreuses
     """
     _ensure_cols(df, [num_col, cat_col])
-    d = df[[num_col, cat_col]].copy()
-    d[num_col] = pd.to_numeric(d[num_col], errors="coerce")
-    d = d.dropna(subset=[num_col, cat_col])
-    d = _select_top_k_categories(d, cat_col, top_k)
+    values, codes, labels = _top_k_groups(df, num_col, cat_col, top_k)
 
-    fig = px.box(
-        d, x=cat_col, y=num_col, points="outliers" if showfliers else False,
+    # 5 nombres par catégorie calculés ici : la figure transporte K×5 valeurs, pas N points
+    stats, outliers = _box_stats(_sorted_groups(values, codes, labels.size))
+    color = px.colors.qualitative.Plotly[0]
+    fig = go.Figure(go.Box(x=labels, **stats, marker_color=color, name=num_col))
+    if showfliers:
+        fig.add_trace(go.Scatter(
+            x=np.repeat(labels, [o.size for o in outliers]),
+            y=_f32(np.concatenate(outliers)) if outliers else [],
+            mode="markers", marker_color=color, name="outliers", showlegend=False,
+        ))
+    fig.update_layout(
         title=title or f"{num_col} par {cat_col} (Top-{top_k})",
-        labels={cat_col: cat_col, num_col: num_col},
+        xaxis_title=cat_col,
+        yaxis_title=num_col,
+        template="plotly_white",
     )
-    fig.update_layout(template="plotly_white")
     fig.update_xaxes(tickangle=rotate)
     return fig
 
 
+@_cached_figure
 def plot_violin_num_by_cat(
     df: pd.DataFrame,
     num_col: str,
@@ -240,24 +783,41 @@ def plot_violin_num_by_cat(
     - box=True: superpose un boxplot à l'intérieur du violon.
     """
     _ensure_cols(df, [num_col, cat_col])
-    d = df[[num_col, cat_col]].copy()
-    d[num_col] = pd.to_numeric(d[num_col], errors="coerce")
-    d = d.dropna(subset=[num_col, cat_col])
-    d = _select_top_k_categories(d, cat_col, top_k)
+    values, codes, labels = _top_k_groups(df, num_col, cat_col, top_k)
 
-    fig = px.violin(
-        d, x=cat_col, y=num_col, box=box, points=False,
+    # densités calculées ici : la figure transporte K×n_grid points, pas N valeurs à
+    # réestimer côté navigateur ; chaque violon = contour fermé centré sur sa position k
+    groups = _sorted_groups(values, codes, labels.size)
+    color = px.colors.qualitative.Plotly[0]
+    fig = go.Figure()
+    for k, (grid, dens) in enumerate(_kde(groups)):
+        half_width = 0.4 * dens / dens.max()
+        fig.add_trace(go.Scatter(
+            x=_f32(np.concatenate((k + half_width, (k - half_width)[::-1]))),
+            y=_f32(np.concatenate((grid, grid[::-1]))),
+            mode="lines", fill="toself", line=dict(color=color, width=1), opacity=0.6,
+            name=labels[k], hoveron="fills", showlegend=False,
+        ))
+    if box:
+        stats, _ = _box_stats(groups)
+        fig.add_trace(go.Box(
+            x=np.arange(labels.size), **stats, width=0.08, name=num_col, showlegend=False,
+            fillcolor="white", line=dict(color=color, width=1),
+        ))
+    fig.update_layout(
         title=title or f"{num_col} par {cat_col} (Top-{top_k})",
-        labels={cat_col: cat_col, num_col: num_col},
+        xaxis_title=cat_col,
+        yaxis_title=num_col,
+        template="plotly_white",
     )
-    fig.update_layout(template="plotly_white")
-    fig.update_xaxes(tickangle=rotate)
+    fig.update_xaxes(tickmode="array", tickvals=np.arange(labels.size), ticktext=labels, tickangle=rotate)
     return fig
 
 
 # ---------------------------------------------------------------------
 # BIVARIÉ — Qualitatif ↔ Qualitatif
 # ---------------------------------------------------------------------
+@_cached_figure
 def plot_heatmap_cat_cat(
     df: pd.DataFrame,
     a: str,
@@ -276,17 +836,47 @@ def plot_heatmap_cat_cat(
         "columns" -> proportions par colonne
     """
     _ensure_cols(df, [a, b])
-    d = df[[a, b]].dropna().copy()
-    # limiter aux top modalités
-    a_top = d[a].value_counts().head(top_k_a).index
-    b_top = d[b].value_counts().head(top_k_b).index
-    d = d[d[a].isin(a_top) & d[b].isin(b_top)]
-
-    ct = pd.crosstab(d[a], d[b], normalize=normalize)
-    z = ct.values
+    # codes entiers sur les colonnes complètes (NaN -> -1) : ni dropna ni copie du couple
+    ca, ua = _column_codes(df, a)
+    cb, ub = _column_codes(df, b)
+    valid = (ca >= 0) & (cb >= 0)
+    cat_a = isinstance(df[a].dtype, pd.CategoricalDtype)
+    cat_b = isinstance(df[b].dtype, pd.CategoricalDtype)
+    top_a = _sorted_codes(_top_k_masked(ca, valid, len(ua), top_k_a, cat_a), ua, categorical=cat_a)
+    top_b = _sorted_codes(_top_k_masked(cb, valid, len(ub), top_k_b, cat_b), ub, categorical=cat_b)
+
+    # remappage code -> ligne/colonne de la matrice ; la case finale (-1 = NaN) reste à -1,
+    # de sorte qu'un seul masque écarte à la fois les NaN et les modalités hors top-k
+    ra = np.full(len(ua) + 1, -1, dtype=np.intp)
+    ra[top_a] = np.arange(top_a.size)
+    rb = np.full(len(ub) + 1, -1, dtype=np.intp)
+    rb[top_b] = np.arange(top_b.size)
+    rai, rbi = ra[ca], rb[cb]
+    m = (rai >= 0) & (rbi >= 0)
+    z = np.zeros((top_a.size, top_b.size), dtype=np.int64)
+    np.add.at(z, (rai[m], rbi[m]), 1)
+
+    # comme pd.crosstab : lignes/colonnes sans aucune observation retirées
+    rows, cols = z.sum(axis=1) > 0, z.sum(axis=0) > 0
+    z = z[rows][:, cols]
+    y_labels = ua[top_a][rows].astype(str)
+    x_labels = ub[top_b][cols].astype(str)
+
+    # normalisation en place sur la matrice (pas de DataFrame intermédiaire par axe)
+    axis = {True: None, "all": None, "index": 1, "columns": 0}
+    if normalize in (None, False):
+        pass
+    elif normalize in axis:
+        tot = z.sum(axis=axis[normalize], keepdims=True)
+        z = z.astype(np.float64)
+        np.divide(z, tot, out=z, where=tot != 0)
+    else:
+        raise ValueError(f"normalize invalide : {normalize!r}")
+
     fig = go.Figure(
         data=go.Heatmap(
-            z=z, x=ct.columns.astype(str), y=ct.index.astype(str),
+            z=_f32(z) if z.dtype.kind == "f" else np.ascontiguousarray(z),
+            x=np.asarray(x_labels), y=np.asarray(y_labels),
             coloraxis="coloraxis"
         )
     )
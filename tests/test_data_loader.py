@@ -0,0 +1,139 @@
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+import src.data_loader as dl
+
+
+# ---------------------------------------------------------------------
+# load_parquet_safe : cache .norm.pkl
+# ---------------------------------------------------------------------
+@pytest.fixture
+def processed_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(dl, "PROJECT_ROOT", tmp_path)
+    monkeypatch.setattr(dl, "DATA_PROCESSED_PATH", tmp_path / "processed")
+    return tmp_path / "processed"
+
+
+def _lists_frame():
+    return pd.DataFrame({
+        "id": [1, 2, 3],
+        "tags": [["easy", "main-dish"], [], None],
+        "ingredients": [None, None, None],
+        "steps": [["mix"], ["l'huile", "cuire"], ["a", "b", "c"]],
+    })
+
+
+def _fail_load_parquet(*args, **kwargs):
+    raise AssertionError("le parquet ne devrait pas être relu")
+
+
+def test_load_parquet_safe_sidecar_hit(processed_dir, monkeypatch):
+    dl.save_parquet(_lists_frame(), "lists.parquet")
+    first = dl.load_parquet_safe("lists.parquet")
+    sidecar = processed_dir / "lists.norm.pkl"
+    assert sidecar.exists()
+    assert first.attrs["normalized_list_cols"] == ("tags", "ingredients", "steps")
+
+    monkeypatch.setattr(dl, "load_parquet", _fail_load_parquet)
+    pd.testing.assert_frame_equal(dl.load_parquet_safe("lists.parquet"), first)
+
+
+def test_load_parquet_safe_sidecar_invalidated_by_newer_parquet(processed_dir):
+    dl.save_parquet(_lists_frame(), "lists.parquet")
+    dl.load_parquet_safe("lists.parquet")
+    sidecar = processed_dir / "lists.norm.pkl"
+    mtime = sidecar.stat().st_mtime
+
+    dl.save_parquet(_lists_frame().assign(id=[7, 8, 9]), "lists.parquet")
+    os.utime(processed_dir / "lists.parquet", (mtime + 10, mtime + 10))
+    assert dl.load_parquet_safe("lists.parquet")["id"].tolist() == [7, 8, 9]
+    assert sidecar.stat().st_mtime > mtime  # cache réécrit
+
+
+def test_load_parquet_safe_sidecar_checks_list_cols(processed_dir):
+    dl.save_parquet(_lists_frame(), "lists.parquet")
+    dl.load_parquet_safe("lists.parquet", list_cols=["tags"])
+    got = dl.load_parquet_safe("lists.parquet")
+    assert got.attrs["normalized_list_cols"] == ("tags", "ingredients", "steps")
+    assert got["steps"].tolist() == _lists_frame()["steps"].tolist()
+
+
+@pytest.mark.parametrize("kwargs", [{"use_cache": False}, {"columns": ["id", "tags"]}])
+def test_load_parquet_safe_without_cache(processed_dir, kwargs):
+    dl.save_parquet(_lists_frame(), "lists.parquet")
+    dl.load_parquet_safe("lists.parquet", **kwargs)
+    assert not (processed_dir / "lists.norm.pkl").exists()
+
+
+# ---------------------------------------------------------------------
+# Parquet : colonnes liste en list<string>
+# ---------------------------------------------------------------------
+def test_save_parquet_writes_list_string_columns(processed_dir):
+    df = _lists_frame()
+    out = dl.save_parquet(df, "lists.parquet")
+    schema = pq.read_schema(out)
+    for c in ("tags", "ingredients", "steps"):
+        assert schema.field(c).type == pa.list_(pa.string())
+
+    arrow = dl.load_parquet("lists.parquet", dtype_backend="pyarrow")
+    assert all(dl._is_arrow_list(arrow[c]) for c in ("tags", "ingredients", "steps"))
+    safe = dl.load_parquet_safe("lists.parquet", use_cache=False)
+    for c in ("tags", "ingredients", "steps"):
+        assert safe[c].tolist() == df[c].tolist()
+
+
+# ---------------------------------------------------------------------
+# Lecture CSV pyarrow : même résultat que pd.read_csv
+# ---------------------------------------------------------------------
+@pytest.fixture
+def recipes_csv(tmp_path):
+    rows = [
+        {
+            "name": f"recette {i}",
+            "id": i,
+            "minutes": i % 7 * 10,
+            "submitted": "2008-01-0%d" % (i % 9 + 1),
+            "description": (
+                f"ligne 1 de {i}\nligne 2, avec \"guillemets\"" if i % 3 else ("NA" if i % 2 else "")
+            ),
+            "rating": i / 4 if i % 5 else None,
+        }
+        for i in range(400)
+    ]
+    path = tmp_path / "recipes.csv"
+    pd.DataFrame(rows).to_csv(path, index=False)
+    return path
+
+
+def test_read_csv_arrow_matches_pandas_with_quoted_newlines(recipes_csv, monkeypatch):
+    # blocs minuscules : des champs multi-lignes chevauchent forcément une frontière de bloc
+    monkeypatch.setattr(dl, "_ARROW_CSV_BLOCK_SIZE", 1 << 10)
+    got = dl._read_csv_arrow(recipes_csv)
+    pd.testing.assert_frame_equal(got, pd.read_csv(recipes_csv))
+
+
+def test_read_csv_arrow_missing_strings_are_nan(recipes_csv):
+    got = dl._read_csv_arrow(recipes_csv)
+    missing = got.loc[got["description"].isna(), "description"]
+    assert len(missing) > 0
+    assert all(v != v for v in missing)  # NaN, pas None
+
+
+def test_read_csv_arrow_keeps_temporal_text(tmp_path, monkeypatch):
+    monkeypatch.setattr(dl, "_ARROW_CSV_BLOCK_SIZE", 1 << 10)
+    n = 300
+    df = pd.DataFrame({
+        "id": range(n),
+        "ts": ["2020-01-01T10:00:00", "2020-01-01 10:00:00.5", "2020-01-01T10:00:00Z"] * (n // 3),
+        "day": ["2008-01-0%d" % (i % 9 + 1) for i in range(n)],
+        "hour": ["10:00:00", "23:59:59"] * (n // 2),
+    })
+    path = tmp_path / "temporal.csv"
+    df.to_csv(path, index=False)
+    got = dl._read_csv_arrow(path)
+    pd.testing.assert_frame_equal(got, pd.read_csv(path))
+    assert got["ts"].tolist()[:3] == df["ts"].tolist()[:3]
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.Descriptive import summarize_numeric
+
+
+PERCENTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+
+def _reference(df, column):
+    # calcul de référence, une méthode pandas par indicateur
+    s = pd.to_numeric(df[column], errors="coerce").dropna()
+    out = {
+        "count": s.size,
+        "missing": df[column].isna().sum(),
+        "min": s.min() if not s.empty else np.nan,
+        "q1": s.quantile(0.25) if not s.empty else np.nan,
+        "median": s.median() if not s.empty else np.nan,
+        "mean": s.mean() if not s.empty else np.nan,
+        "q3": s.quantile(0.75) if not s.empty else np.nan,
+        "max": s.max() if not s.empty else np.nan,
+        "std": s.std(ddof=1) if s.size > 1 else np.nan,
+        "skew": s.skew() if s.size > 2 else np.nan,
+        "kurtosis": s.kurt() if s.size > 3 else np.nan,
+        "unique": s.nunique(),
+    }
+    for p in PERCENTILES:
+        out[f"p{int(p*100):02d}"] = s.quantile(p) if not s.empty else np.nan
+    return pd.DataFrame([out], index=[column])
+
+
+def _frame():
+    rng = np.random.default_rng(0)
+    n = 2_000
+    return pd.DataFrame({
+        "int": rng.integers(0, 100, n),
+        "int32": rng.integers(-5, 5, n).astype(np.int32),
+        "uint8": rng.integers(0, 200, n).astype(np.uint8),
+        "float": rng.normal(size=n),
+        "float32": rng.normal(size=n).astype(np.float32),
+        "with_nan": np.where(rng.random(n) < 0.1, np.nan, rng.exponential(size=n)),
+        "nullable": pd.array(rng.integers(0, 50, n), dtype="Int64"),
+        "text": rng.integers(0, 9, n).astype(str),
+        "empty": np.full(n, np.nan),
+        "single": np.r_[3.0, np.full(n - 1, np.nan)],
+    })
+
+
+@pytest.mark.parametrize("column", list(_frame().columns))
+def test_summarize_numeric_matches_pandas(column):
+    df = _frame()
+    got = summarize_numeric(df, column, percentiles=PERCENTILES)
+    pd.testing.assert_frame_equal(got, _reference(df, column), check_exact=True)
+
+
+def test_summarize_numeric_keeps_integer_min_max():
+    got = summarize_numeric(pd.DataFrame({"n": np.arange(100)}), "n")
+    assert got.loc["n", "min"] == 0 and got.loc["n", "max"] == 99
+    assert got["min"].dtype == got["max"].dtype == np.int64
@@ -0,0 +1,15 @@
+import numpy as np
+import pandas as pd
+
+from src.feature_engineering import add_recipe_features
+
+
+def test_description_length_matches_str_split():
+    spaces = [chr(c) for c in range(0x110000) if chr(c).isspace()]
+    texts = [f"a{w}b c" for w in spaces] + [
+        "", "   ", "un  deux\ttrois\nquatre", "a\xa0b c", "  bords  ", "é à ü ß", 42, 3.5, np.nan,
+    ]
+    df = pd.DataFrame({"description_filled": pd.Series(texts, dtype=object)})
+    out = add_recipe_features(df)["description_length"]
+    expected = df["description_filled"].fillna("").apply(lambda x: len(str(x).split()))
+    assert out.tolist() == expected.tolist()
@@ -0,0 +1,202 @@
+import ast
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import src.data_loader as dl
+import src.preprocessing as pp
+
+
+# ---------------------------------------------------------------------
+# Parsing des colonnes list-like : même résultat que ast.literal_eval
+# ---------------------------------------------------------------------
+LIST_STRINGS = [
+    "['a', 'b']", " ['lead']", "\t['tab']", "  [51.5, 0.0]", "[]", "['it''s']",
+    "[\"l'apostrophe\", 'x']", "['back\\\\slash']", "[None, 1]", "['a']  ",
+    "not a list", "", "   ", "[unbalanced", "{'a': 1}", "(1, 2)",
+]
+
+
+def _literal_list(x):
+    try:
+        v = ast.literal_eval(x)
+    except (ValueError, SyntaxError):
+        return None
+    return v if isinstance(v, list) else None
+
+
+@pytest.mark.parametrize("x", LIST_STRINGS)
+def test_parse_list_str_matches_literal_eval(x):
+    assert pp._parse_list_str(x) == _literal_list(x)
+
+
+@pytest.mark.parametrize("x", LIST_STRINGS)
+def test_to_list_or_none_matches_literal_eval(x):
+    assert dl._to_list_or_none(x) == _literal_list(x)
+
+
+# ---------------------------------------------------------------------
+# Nutrition : pad (NaN) / truncate à len(output_cols)
+# ---------------------------------------------------------------------
+def test_split_nutrition_columns_pads_truncates_and_skips_non_numeric():
+    df = pd.DataFrame({"nutrition": [
+        [1.0, 2.0, 3.0],
+        [1, 2],
+        [1, 2, 3, 4, 5],
+        np.array([7.0, 8.0, 9.0]),
+        "[4.0, 5.0, 6.0]",
+        "[4.0]",
+        None,
+        np.nan,
+        "not a list",
+        [1.0, "x", 3.0],
+        ["1.5", 2, None],
+    ]}, index=range(10, 21))
+    nan = np.nan
+    expected = np.array([
+        [1, 2, 3], [1, 2, nan], [1, 2, 3], [7, 8, 9], [4, 5, 6], [4, nan, nan],
+        [nan, nan, nan], [nan, nan, nan], [nan, nan, nan], [1, nan, 3], [1.5, 2, nan],
+    ])
+    out = pp.split_nutrition_columns(df, output_cols=["a", "b", "c"])
+    assert list(out.columns) == ["nutrition", "a", "b", "c"]
+    assert out.index.equals(df.index)
+    assert (out[["a", "b", "c"]].dtypes == np.float64).all()
+    np.testing.assert_array_equal(out[["a", "b", "c"]].to_numpy(), expected)
+
+
+@pytest.mark.parametrize("bad", [None, "x"])
+def test_nutrition_array_bulk_path_matches_cell_by_cell(bad):
+    rng = np.random.default_rng(19)
+    rows = rng.uniform(0, 500, (200, 7)).round(1).tolist()
+    rows[17][3] = bad  # None -> NaN dans le bloc ; "x" -> repli cellule par cellule
+    values = np.empty(len(rows) + 1, dtype=object)
+    values[:-1] = rows
+    values[-1] = [1.0] * 9  # trop longue : toujours cellule par cellule
+    expected = np.array(rows[:17] + [rows[17][:3] + [np.nan] + rows[17][4:]] + rows[18:] + [[1.0] * 7])
+    np.testing.assert_array_equal(pp._nutrition_array(values, 7), expected)
+
+
+def test_split_nutrition_columns():
+    df = pd.DataFrame({"nutrition": ["[51.5, 0.0, 13.0, 0.0, 2.0, 0.0, 4.0]", "[1.0]", None]})
+    out = pp.split_nutrition_columns(df, drop_original=True)
+    assert list(out.columns) == list(pp.NUTRITION_COLS)
+    np.testing.assert_array_equal(out.iloc[0], [51.5, 0.0, 13.0, 0.0, 2.0, 0.0, 4.0])
+    assert out.iloc[1, 0] == 1.0 and out.iloc[1, 1:].isna().all() and out.iloc[2].isna().all()
+    assert "nutrition" in df.columns  # copy=True : original intact
+    with pytest.raises(ValueError):
+        pp.split_nutrition_columns(out.assign(nutrition=df["nutrition"]))
+
+
+# ---------------------------------------------------------------------
+# Descriptions auto : version vectorisée == version ligne à ligne
+# ---------------------------------------------------------------------
+def _recipes_frame():
+    return pd.DataFrame({
+        "description": ["kept as is", np.nan, "   ", None, "", np.nan, 3.0, np.nan],
+        "minutes": [10, 45, 200, np.nan, 29.9, 90, 5, "abc"],
+        "n_steps": [3, 12, 7, 4, np.nan, 5, 11, 6],
+        "n_ingredients": [4, 3, 8, 5, 6, 5, 2, np.nan],
+        "tags": [
+            ["main-dish", "easy"], ["60-minutes-or-less"], [], np.nan,
+            [" - "], [3, "x"], "not-a-list", ["low-carb"],
+        ],
+    })
+
+
+def _assert_same_as_rowwise(df):
+    vec = pp.generate_auto_descriptions(df)
+    ref = df.apply(pp.generate_auto_description, axis=1)
+    assert vec.index.equals(df.index)
+    assert vec.tolist() == ref.tolist()
+
+
+def test_generate_auto_descriptions_matches_rowwise():
+    _assert_same_as_rowwise(_recipes_frame())
+
+
+@pytest.mark.parametrize("col", ["tags", "description"])
+def test_generate_auto_descriptions_all_nan_column(col):
+    df = _recipes_frame()
+    df[col] = np.nan  # colonne float64 entièrement NaN
+    _assert_same_as_rowwise(df)
+
+
+def test_generate_auto_descriptions_missing_columns():
+    _assert_same_as_rowwise(pd.DataFrame({"minutes": [10.0, 100.0]}, index=[5, 7]))
+
+
+# ---------------------------------------------------------------------
+# Downcast numérique
+# ---------------------------------------------------------------------
+def _numeric_frame():
+    return pd.DataFrame({
+        "n_steps": np.array([1, 5, 40], dtype=np.int64),
+        "minutes": np.array([10, 60, 2147483647], dtype=np.int64),
+        "neg": np.array([-(2 ** 30) + 1, 0, 2 ** 30 - 1], dtype=np.int64),
+        "at_limit": np.array([0, 1, 2 ** 30], dtype=np.int64),
+        "u": np.array([0, 7, 9], dtype=np.uint64),
+        "calories": [51.5, np.nan, 1e3],
+        "flag": [True, False, True],
+        "cat": pd.Categorical(list("aba")),
+        "when": pd.to_datetime(["2008-01-01", "2009-02-03", None]),
+        "nullable": pd.array([1, None, 3], dtype="Int64"),
+        "small": np.array([1, 2, 3], dtype=np.int16),
+    })
+
+
+def test_downcast_numeric_columns_dtypes():
+    df = _numeric_frame()
+    out = pp.downcast_numeric_columns(df)
+    assert out.dtypes.to_dict() == {
+        "n_steps": np.int32, "minutes": np.int64, "neg": np.int32, "at_limit": np.int64,
+        "u": np.int32, "calories": np.float32, "flag": bool, "cat": df["cat"].dtype,
+        "when": df["when"].dtype, "nullable": pd.Int64Dtype(), "small": np.int16,
+    }
+    for col in df.columns:
+        pd.testing.assert_series_equal(out[col], df[col].astype(out[col].dtype))
+    assert df["n_steps"].dtype == np.int64  # copy=True : original intact
+
+
+def test_downcast_numeric_columns_keeps_arithmetic_headroom():
+    out = pp.downcast_numeric_columns(_numeric_frame())
+    assert (out["minutes"] * 2).tolist() == [20, 120, 2 * 2147483647]
+    assert (out["neg"] * 2).tolist() == [-(2 ** 31) + 2, 0, 2 ** 31 - 2]
+
+
+def test_downcast_numeric_columns_in_place_and_empty():
+    df = pd.DataFrame({"a": np.array([], dtype=np.int64), "b": np.array([], dtype=np.float64)})
+    assert pp.downcast_numeric_columns(df, copy=False) is df
+    assert df.dtypes.tolist() == [np.int32, np.float32]
+
+
+# ---------------------------------------------------------------------
+# Helpers list-like : cellules déjà normalisées ou manquantes
+# ---------------------------------------------------------------------
+@pytest.mark.parametrize("helper", [pp._ensure_list_or_none, dl._to_list_or_none])
+def test_list_helpers_short_circuit_lists_and_missing(helper):
+    cell = ["main-dish", "easy", "30-minutes-or-less"]
+    assert helper(cell) is cell
+    for missing in (None, np.nan, np.float64("nan"), pd.NA, 3.0):
+        assert helper(missing) is None
+
+
+# ---------------------------------------------------------------------
+# Colonnes list-like en parallèle
+# ---------------------------------------------------------------------
+def _list_like_frame(n=300):
+    return pd.DataFrame({
+        "tags": ["['a', 'b-c']", " ['lead']", None, "[]", "not a list"] * (n // 5),
+        "ingredients": ["['salt', \"l'huile\"]", np.nan, "['x']", "[1, 2]", ["déjà", "liste"]] * (n // 5),
+        "steps": ["['mix', 'bake']"] * n,
+        "other": range(n),
+    })
+
+
+def test_convert_list_like_columns_parallel_matches_serial():
+    df = _list_like_frame()
+    serial = pp.convert_list_like_columns(df, n_jobs=1)
+    parallel = pp.convert_list_like_columns(df, n_jobs=3)
+    pd.testing.assert_frame_equal(parallel, serial)
+    assert serial["tags"].iloc[1] == ["lead"] and serial["tags"].iloc[2] is None
+    assert df["tags"].iloc[0] == "['a', 'b-c']"  # copy=True : original intact
@@ -0,0 +1,412 @@
+import gc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import src.visualization as viz
+
+
+@pytest.fixture(autouse=True)
+def _empty_caches():
+    viz.clear_figure_cache()
+    yield
+    viz.clear_figure_cache()
+
+
+# ---------------------------------------------------------------------
+# Top-k : ex aequo départagés comme value_counts
+# ---------------------------------------------------------------------
+def _stable_value_counts(s, dropna=True):
+    # value_counts trie par quicksort : ordre des ex aequo non garanti, d'où un tri stable
+    return s.value_counts(dropna=dropna, sort=False).sort_values(ascending=False, kind="stable")
+
+
+def _tied_columns():
+    rng = np.random.default_rng(9)
+    many = rng.permutation(np.repeat([f"m{i:02d}" for i in range(100)], 5))
+    with_na = np.array(["b", None, "a", "c", "a", "b", None, "c", np.nan, "d", np.nan], dtype=object)
+    return {
+        "distinct": pd.Series(list("abcdefghij")),
+        "many": pd.Series(many),
+        "many_cat": pd.Series(pd.Categorical(many, categories=sorted(set(many))[::-1])),
+        "with_na": pd.Series(with_na),
+        "float_na": pd.Series([2.0, np.nan, 1.0, 1.0, np.nan, 2.0, 3.0]),
+        "cat_na": pd.Series(pd.Categorical(with_na, categories=list("dcba"))),
+    }
+
+
+@pytest.mark.parametrize("name", list(_tied_columns()))
+@pytest.mark.parametrize("top_k", [0, 1, 2, 3, 10])
+def test_top_k_groups_ties_match_value_counts(name, top_k):
+    c = _tied_columns()[name]
+    rng = np.random.default_rng(10)
+    df = pd.DataFrame({"c": c, "v": np.where(rng.random(len(c)) < 0.2, np.nan, rng.random(len(c)))})
+    # version de base : dropna puis value_counts().head(top_k)
+    d = df.dropna(subset=["v", "c"])
+    ref = set(_stable_value_counts(d["c"]).head(top_k).index.astype(str))
+    values, codes, labels = viz._top_k_groups(df, "v", "c", top_k)
+    assert set(labels) == ref
+    np.testing.assert_array_equal(values, d["v"][d["c"].astype(str).isin(ref)].to_numpy())
+    np.testing.assert_array_equal(labels[codes], d["c"][d["c"].astype(str).isin(ref)].astype(str))
+
+
+# ---------------------------------------------------------------------
+# Boxplots précalculés : mêmes statistiques que Plotly
+# ---------------------------------------------------------------------
+def test_box_stats_match_numpy_and_plotly_fences():
+    rng = np.random.default_rng(4)
+    groups = [np.sort(rng.exponential(3, n)) for n in (1, 2, 7, 500)]
+    stats, outliers = viz._box_stats(groups)
+    for c, seg in enumerate(groups):
+        q1, med, q3 = np.quantile(seg, [0.25, 0.5, 0.75])
+        lo, hi = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+        inside = seg[(seg >= lo) & (seg <= hi)]
+        assert (stats["q1"][c], stats["median"][c], stats["q3"][c]) == pytest.approx((q1, med, q3))
+        assert stats["lowerfence"][c] == inside.min()
+        assert stats["upperfence"][c] == inside.max()
+        np.testing.assert_array_equal(outliers[c], seg[(seg < lo) | (seg > hi)])
+
+
+def test_box_num_by_cat_keeps_top_k_categories():
+    rng = np.random.default_rng(5)
+    df = pd.DataFrame({
+        "v": rng.random(1_000),
+        "c": rng.choice(list("abcdef"), 1_000, p=[0.4, 0.3, 0.1, 0.1, 0.05, 0.05]),
+    })
+    fig = viz.plot_box_num_by_cat(df, "v", "c", top_k=2)
+    box = fig.data[0]
+    assert sorted(box.x) == ["a", "b"]
+    for label, med in zip(box.x, box.median):
+        assert med == pytest.approx(df.loc[df["c"] == label, "v"].median())
+
+
+def test_box_num_by_cat_ignores_infinite_values():
+    df = pd.DataFrame({"v": [1, np.inf, 3, 4, -np.inf, 6], "c": list("aabbba")})
+    box = viz.plot_box_num_by_cat(df, "v", "c").data[0]
+    assert list(box.x) == ["a", "b"]
+    np.testing.assert_allclose(box.median, [np.median([1, 6]), np.median([3, 4])])
+    np.testing.assert_allclose(box.upperfence, [6, 4])
+
+
+# ---------------------------------------------------------------------
+# Heatmap : équivalence avec pd.crosstab
+# ---------------------------------------------------------------------
+def _heatmap_frame():
+    rng = np.random.default_rng(3)
+    n = 2_000
+    level = pd.Categorical(
+        rng.choice(["low", "mid", "high"], n), categories=["low", "mid", "high"], ordered=True
+    )
+    return pd.DataFrame({
+        "a": pd.Series(rng.choice(list("pqrstu"), n)).where(rng.random(n) > 0.05),
+        "b": rng.choice(list("xyz"), n),
+        "level": level,
+    })
+
+
+@pytest.mark.parametrize("normalize", [None, "all", "index", "columns"])
+@pytest.mark.parametrize("a, b", [("a", "b"), ("level", "b"), ("b", "level")])
+def test_heatmap_matches_crosstab(a, b, normalize):
+    df = _heatmap_frame()
+    fig = viz.plot_heatmap_cat_cat(df, a, b, normalize=normalize)
+    ref = pd.crosstab(df[a], df[b], normalize=normalize if normalize else False)
+    heat = fig.data[0]
+    assert list(heat.y) == list(ref.index.astype(str))
+    assert list(heat.x) == list(ref.columns.astype(str))
+    np.testing.assert_allclose(heat.z, ref.to_numpy(), rtol=1e-6)
+
+
+def test_heatmap_keeps_category_order():
+    df = _heatmap_frame()
+    fig = viz.plot_heatmap_cat_cat(df, "level", "b")
+    assert list(fig.data[0].y) == ["low", "mid", "high"]
+
+
+@pytest.mark.parametrize("name", ["distinct", "many", "many_cat", "with_na", "cat_na"])
+def test_heatmap_ties_match_value_counts(name):
+    c = _tied_columns()[name]
+    df = pd.DataFrame({"c": c, "b": np.random.default_rng(10).choice(list("xy"), len(c))})
+    heat = viz.plot_heatmap_cat_cat(df, "c", "b", top_k_a=3).data[0]
+    d = df[["c", "b"]].dropna()
+    assert set(heat.y) == set(_stable_value_counts(d["c"]).head(3).index.astype(str))
+
+
+# ---------------------------------------------------------------------
+# Histogramme pré-binné
+# ---------------------------------------------------------------------
+def _hist_frame():
+    rng = np.random.default_rng(11)
+    x = np.r_[rng.lognormal(2, 1, 5_000), 0.0, -3.0, np.nan, np.inf, -np.inf]
+    return pd.DataFrame({"x": x, "s": pd.Series(x).astype(str)})
+
+
+@pytest.mark.parametrize("col", ["x", "s"])
+@pytest.mark.parametrize("max_x", [None, 30.0])
+def test_hist_counts_match_np_histogram(col, max_x):
+    df = _hist_frame()
+    v = df["x"].to_numpy()
+    v = v[np.isfinite(v)]
+    if max_x is not None:
+        v = v[v <= max_x]
+    fig = viz.plot_hist_interactive(df, col, bins=20, max_x=max_x)
+    counts, edges = np.histogram(v, bins=20)
+    bar = fig.data[0]
+    np.testing.assert_array_equal(bar.y, counts)
+    np.testing.assert_allclose(bar.x, 0.5 * (edges[:-1] + edges[1:]), rtol=1e-6)
+    np.testing.assert_allclose(bar.width, np.diff(edges), rtol=1e-6)
+
+
+def test_hist_log_x_uses_log_spaced_bins():
+    df = _hist_frame()
+    v = df["x"].to_numpy()
+    v = v[np.isfinite(v) & (v > 0)]
+    fig = viz.plot_hist_interactive(df, "x", bins=15, log_x=True)
+    edges = np.logspace(np.log10(v.min()), np.log10(v.max()), 16)
+    bar = fig.data[0]
+    np.testing.assert_array_equal(bar.y, np.histogram(v, bins=edges)[0])
+    np.testing.assert_allclose(bar.x, np.sqrt(edges[:-1] * edges[1:]), rtol=1e-6)
+    assert fig.layout.xaxis.type == "log"
+
+
+def test_hist_without_finite_values():
+    df = pd.DataFrame({"x": [np.nan, np.inf, -np.inf]})
+    for log_x in (False, True):
+        fig = viz.plot_hist_interactive(df, "x", bins=5, log_x=log_x)
+        assert fig.data[0].y.sum() == 0
+
+
+# ---------------------------------------------------------------------
+# Nuages : sous-échantillonnage
+# ---------------------------------------------------------------------
+@pytest.mark.parametrize("n, n_out", [(100, 500), (10_000, 500), (50_000, 2_000)])
+def test_downsample_xy_keeps_extremes_within_budget(n, n_out):
+    rng = np.random.default_rng(n)
+    x, y = rng.normal(size=n), rng.standard_t(2, size=n)
+    idx = viz._downsample_xy(x, y, n_out)
+    assert idx.size == min(n, n_out)
+    np.testing.assert_array_equal(idx, np.unique(idx))
+    assert {y.argmin(), y.argmax()} <= set(idx.tolist())
+    assert (idx >= 0).all() and (idx < n).all()
+
+
+# ---------------------------------------------------------------------
+# Caches (figures, colonnes)
+# ---------------------------------------------------------------------
+IN_PLACE_EDITS = {
+    "loc": lambda df: df.loc.__setitem__((df["x"] > 50, "x"), 50.0),
+    "iloc": lambda df: df.iloc.__setitem__((0, 0), 1e3),
+    "fillna": lambda df: df.fillna({"x": -5.0}, inplace=True),
+    "clip": lambda df: df.clip(upper=30.0, inplace=True),
+    "mask": lambda df: df.mask(df > 80.0, 0.0, inplace=True),
+    "replace": lambda df: df.replace({"x": {10.0: 500.0}}, inplace=True),
+}
+
+
+@pytest.mark.parametrize("edit", list(IN_PLACE_EDITS))
+def test_default_calls_see_in_place_edits(edit):
+    df = pd.DataFrame({"x": np.r_[np.arange(100.0), np.nan]})
+    viz.plot_hist_interactive(df, "x")
+    IN_PLACE_EDITS[edit](df)
+    fig = viz.plot_hist_interactive(df, "x")
+    ref = viz.plot_hist_interactive.__wrapped__(df, "x")
+    np.testing.assert_array_equal(fig.data[0].x, ref.data[0].x)
+    np.testing.assert_array_equal(fig.data[0].y, ref.data[0].y)
+    assert not viz._fig_cache and not viz._col_cache
+
+
+def test_default_calls_see_in_place_categorical_edits():
+    df = pd.DataFrame({"k": list("aabbbc") * 10})
+    viz.plot_bar_categorical(df, "k", normalize=False)
+    df.loc[df["k"] == "b", "k"] = "z"
+    fig = viz.plot_bar_categorical(df, "k", normalize=False)
+    assert list(fig.data[0].x) == ["z", "a", "c"]
+
+
+def test_figure_cache_hit_returns_independent_copy():
+    df = pd.DataFrame({"x": np.arange(100.0)})
+    f1 = viz.plot_hist_interactive(df, "x", bins=10, use_cache=True)
+    f1.update_layout(title="modifié")
+    f2 = viz.plot_hist_interactive(df, "x", bins=10, use_cache=True)
+    assert f2.layout.title.text == "Distribution de x"
+    np.testing.assert_array_equal(f1.data[0].y, f2.data[0].y)
+    assert len(viz._fig_cache) == 1
+
+
+@pytest.mark.parametrize("n", [10, 1_000, 20_000])
+def test_figure_cache_invalidated_by_column_reassignment(n):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"y": rng.random(n), "x": rng.random(n)})
+    for it in range(50):
+        df["x"] = df["y"] + it
+        fig = viz.plot_hist_interactive(df, "x", use_cache=True)
+        ref = viz.plot_hist_interactive.__wrapped__(df, "x")
+        np.testing.assert_array_equal(fig.data[0].x, ref.data[0].x)
+
+
+def test_figure_cache_invalidated_by_categorical_reassignment():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"k": pd.Categorical(rng.choice(list("abc"), 500))})
+    for it in range(100):
+        df["k"] = pd.Categorical(rng.choice(list("abcdef")[: 2 + it % 4], 500))
+        fig = viz.plot_bar_categorical(df, "k", use_cache=True)
+        ref = viz.plot_bar_categorical.__wrapped__(df, "k")
+        np.testing.assert_array_equal(fig.data[0].x, ref.data[0].x)
+        np.testing.assert_allclose(fig.data[0].y, ref.data[0].y)
+
+
+def test_column_cache_invalidated_by_column_reassignment():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({"v": rng.random(1_000), "k": rng.choice(list("ab"), 1_000)})
+    for it in range(50):
+        df["v"] = rng.random(1_000) + it
+        df["k"] = pd.Categorical(rng.choice(list("abcdef")[: 2 + it % 4], 1_000))
+        # top_k change à chaque tour : figure jamais en cache, colonnes relues dans _col_cache
+        hist = viz.plot_hist_interactive(df, "v", bins=10 + it, use_cache=True)
+        ref = viz.plot_hist_interactive.__wrapped__(df, "v", bins=10 + it)
+        np.testing.assert_array_equal(hist.data[0].y, ref.data[0].y)
+        bar = viz.plot_bar_categorical(df, "k", top_k=10 + it, use_cache=True)
+        ref = viz.plot_bar_categorical.__wrapped__(df, "k", top_k=10 + it)
+        assert list(bar.data[0].x) == list(ref.data[0].x)
+        np.testing.assert_array_equal(bar.data[0].y, ref.data[0].y)
+
+
+def test_column_cache_shared_between_plots():
+    df = pd.DataFrame({"c": list("aabbbc") * 10})
+    viz.plot_bar_categorical(df, "c", use_cache=True)
+    cached = dict(viz._col_cache)
+    viz.plot_pie_categorical(df, "c", use_cache=True)
+    assert dict(viz._col_cache) == cached
+
+
+def test_caches_released_with_dataframe():
+    df = pd.DataFrame({"x": np.arange(1_000.0), "c": list("ab") * 500})
+    viz.plot_hist_interactive(df, "x", use_cache=True)
+    viz.plot_bar_categorical(df, "c", use_cache=True)
+    assert viz._fig_cache and viz._col_cache
+    del df
+    gc.collect()
+    assert not viz._fig_cache and not viz._col_cache
+
+
+def test_figure_cache_is_bounded():
+    df = pd.DataFrame({"x": np.arange(50.0)})
+    for bins in range(1, viz._FIG_CACHE_SIZE + 20):
+        viz.plot_hist_interactive(df, "x", bins=bins, use_cache=True)
+    assert len(viz._fig_cache) == viz._FIG_CACHE_SIZE
+
+
+# ---------------------------------------------------------------------
+# Comptages : libellés des valeurs manquantes comme value_counts
+# ---------------------------------------------------------------------
+@pytest.mark.parametrize("values, dtype", [
+    (["a"] * 6 + [None] * 5 + ["b"] * 2, object),
+    (["a"] * 6 + [np.nan] * 5 + ["b"] * 2, object),
+    (["a"] * 6 + [None] * 4 + [np.nan] * 3 + [pd.NaT] * 2 + ["b"], object),
+    ([None] * 3, object),
+    (["a"] * 6 + [None] * 5 + ["b"] * 2, "category"),
+    (["a"] * 6 + [None] * 5 + ["b"] * 2, "string"),
+    ([1.0] * 6 + [np.nan] * 5 + [2.0] * 2, "float64"),
+])
+def test_bar_and_pie_missing_labels_match_value_counts(values, dtype):
+    df = pd.DataFrame({"c": pd.Series(values, dtype=dtype)})
+    ref = df["c"].value_counts(dropna=False)
+    bar = viz.plot_bar_categorical(df, "c", normalize=False)
+    pie = viz.plot_pie_categorical(df, "c")
+    assert list(bar.data[0].x) == list(ref.index.astype(str))
+    np.testing.assert_array_equal(bar.data[0].y, ref.to_numpy())
+    assert list(pie.data[0].labels) == list(ref.index.astype(str))
+
+
+def test_top_k_counts_matches_value_counts():
+    rng = np.random.default_rng(6)
+    # effectifs tous distincts : l'ordre de value_counts est alors sans ambiguïté
+    values = np.repeat(np.array(list("abcdefgh"), dtype=object), [50, 3, 41, 17, 8, 29, 1, 12])
+    values[rng.choice(values.size, 23, replace=False)] = None
+    df = pd.DataFrame({"c": rng.permutation(values)})
+    for top_k in (0, 1, 3, 8, 9, 50):
+        labels, counts = viz._top_k_counts(df, "c", top_k)
+        ref = df["c"].value_counts(dropna=False).head(top_k)
+        assert list(labels.astype(str)) == list(ref.index.astype(str))
+        np.testing.assert_array_equal(counts, ref.to_numpy())
+
+
+@pytest.mark.parametrize("name", list(_tied_columns()))
+@pytest.mark.parametrize("top_k", [1, 2, 3, 10])
+def test_top_k_counts_ties_match_value_counts(name, top_k):
+    df = pd.DataFrame({"c": _tied_columns()[name]})
+    labels, counts = viz._top_k_counts(df, "c", top_k)
+    ref = _stable_value_counts(df["c"], dropna=False).head(top_k)
+    assert list(labels.astype(str)) == list(ref.index.astype(str))
+    np.testing.assert_array_equal(counts, ref.to_numpy())
+
+
+# ---------------------------------------------------------------------
+# Nuages : tendance LOESS binned
+# ---------------------------------------------------------------------
+def test_loess_binned_is_exact_on_linear_data():
+    x = np.random.default_rng(7).uniform(-5, 1_000, 20_000)
+    cx, cy = viz._loess_binned(x, 3.0 * x - 7.0)
+    assert np.all(np.diff(cx) > 0)
+    np.testing.assert_allclose(cy, 3.0 * cx - 7.0, rtol=1e-9, atol=1e-6)
+
+
+def test_loess_binned_constant_x_gives_mean():
+    y = np.arange(10.0)
+    cx, cy = viz._loess_binned(np.full(10, 2.0), y)
+    np.testing.assert_allclose(cy, y.mean())
+    assert np.all(cx == 2.0)
+
+
+def test_loess_binned_close_to_statsmodels_lowess():
+    lowess = pytest.importorskip("statsmodels.nonparametric.smoothers_lowess").lowess
+    rng = np.random.default_rng(8)
+    x = rng.uniform(0, 10, 5_000)
+    y = np.sin(x) + rng.normal(0, 0.3, x.size)
+    cx, cy = viz._loess_binned(x, y)
+    ref = lowess(y, x, frac=2 / 3, it=0)
+    assert np.abs(cy - np.interp(cx, ref[:, 0], ref[:, 1])).max() < 0.02
+
+
+# ---------------------------------------------------------------------
+# Violin : KDE binned
+# ---------------------------------------------------------------------
+def test_kde_matches_scipy_gaussian_kde():
+    from scipy.stats import gaussian_kde
+
+    rng = np.random.default_rng(0)
+    v = np.sort(np.r_[rng.normal(0, 1, 3_000), rng.normal(5, 0.5, 2_000)])
+    grid, dens = viz._kde([v])[0]
+    q1, q3 = np.quantile(v, [0.25, 0.75])
+    h = 1.059 * min(v.std(ddof=1), (q3 - q1) / 1.349) * v.size ** -0.2
+    ref = gaussian_kde(v, bw_method=h / v.std(ddof=1))(grid)
+    assert np.abs(dens - ref).max() < 1e-2 * ref.max()
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 4])
+def test_kde_small_groups_keep_grid_length(n):
+    v = np.sort(np.random.default_rng(n).normal(size=n))
+    grid, dens = viz._kde([v], n_grid=256)[0]
+    assert grid.shape == dens.shape == (256,)
+    assert np.isfinite(dens).all() and dens.max() > 0
+
+
+def test_violin_outlines_with_tiny_categories():
+    df = pd.DataFrame({
+        "v": [1.0, 2.0, 2.5, 3.0, 4.0, 4.0, 7.0, 9.0, 5.0, 6.0],
+        "c": ["a", "b", "b", "c", "c", "c", "d", "d", "d", "d"],
+    })
+    fig = viz.plot_violin_num_by_cat.__wrapped__(df, "v", "c")
+    outlines = [tr for tr in fig.data if tr.type == "scatter"]
+    assert len(outlines) == 4
+    for tr in outlines:
+        assert len(tr.x) == len(tr.y) == 512
+
+
+def test_violin_num_by_cat_ignores_infinite_values():
+    df = pd.DataFrame({"v": [1, np.inf, 3, 4, -np.inf, 6, 2], "c": list("aabbbaa")})
+    fig = viz.plot_violin_num_by_cat(df, "v", "c")
+    outlines = [tr for tr in fig.data if tr.type == "scatter"]
+    assert len(outlines) == 2
+    for tr in outlines:
+        assert len(tr.y) == 512 and np.isfinite(np.asarray(tr.x, dtype=float)).all()